@@ -4,29 +4,99 @@ Handles environment variables and application settings.
 """
 
 import os
+import re
 import logging
-from pathlib import Path
-from dotenv import load_dotenv
+import functools
+from types import MappingProxyType
+
+# Matches KEY=value lines in a .env file, allowing an optional "export " prefix.
+# Comment lines never match since they don't start with an identifier.
+_ENV_LINE_PATTERN = re.compile(r'^[ \t]*(?:export[ \t]+)?([A-Za-z_][A-Za-z0-9_]*)[ \t]*=[ \t]*(.*?)[ \t]*$',
+                               re.MULTILINE)
+# A double- or single-quoted value, optionally followed by a comment
+_ENV_QUOTED_VALUE_PATTERN = re.compile(r'(?:"((?:[^"\\]|\\.)*)"|\'([^\']*)\')(?:[ \t]*#.*)?')
+# A comment in an unquoted value: a '#' at the start or after whitespace
+_ENV_INLINE_COMMENT_PATTERN = re.compile(r'(?:^|[ \t]+)#.*')
+# Escape sequences expanded inside double-quoted values, as python-dotenv does
+_ENV_ESCAPE_PATTERN = re.compile(r'\\([\\"\'nrt])')
+_ENV_ESCAPES = MappingProxyType({'\\': '\\', '"': '"', "'": "'", 'n': '\n', 'r': '\r', 't': '\t'})
+_ENV_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".env")
+
+
+def _load_env_file(env_path=_ENV_FILE):
+    """
+    Load KEY=value pairs from a .env file into the environment.
+    
+    Values may be double-quoted (with \\n, \\t, \\" and similar escapes), single-quoted
+    (taken literally) or unquoted, and may be followed by a # comment. Variables
+    already set in the environment take precedence over the file. A missing or
+    unreadable file is ignored.
+    
+    Args:
+        env_path (str): Path to the .env file. Defaults to the .env in the project directory.
+    """
+    try:
+        with open(env_path, 'r', encoding='utf-8') as f:
+            data = f.read()
+    except OSError:
+        return
+
+    for key, value in _ENV_LINE_PATTERN.findall(data):
+        quoted = _ENV_QUOTED_VALUE_PATTERN.fullmatch(value)
+        if quoted:
+            double_quoted, single_quoted = quoted.groups()
+            if double_quoted is not None:
+                value = _ENV_ESCAPE_PATTERN.sub(lambda match: _ENV_ESCAPES[match.group(1)], double_quoted)
+            else:
+                value = single_quoted
+        else:
+            value = _ENV_INLINE_COMMENT_PATTERN.sub('', value)
+        os.environ.setdefault(key, value)
+
 
 # Load environment variables from .env file
-load_dotenv()
+_load_env_file()
+
+# Bind the environment mapping once; it stays live, so keys entered at runtime are still seen
+_ENV = os.environ
+
+# getcwd() is a syscall, so resolve the fallback download path once at import time
+_DEFAULT_DOWNLOAD_PATH = _ENV.get("DEFAULT_DOWNLOAD_PATH") or os.getcwd()
 
 # Gemini model constants
 GEMINI_MODEL_FLASH = 'gemini-2.0-flash'           # Faster model for transcription and basic operations
 GEMINI_MODEL_PRO = 'gemini-2.5-pro-preview-03-25' # Advanced model for chatting and complex reasoning
 
+# Default Gemini request rate, the free-tier limit of the Flash model;
+# keys with higher quotas can raise it with GEMINI_REQUESTS_PER_MINUTE
+DEFAULT_GEMINI_REQUESTS_PER_MINUTE = 15
+
+# Supported media file extensions, in the order they are tried when looking up a download
+MEDIA_EXTENSION_PRIORITY = ('.mp4', '.mp3', '.m4a', '.webm', '.mkv', '.opus')
+MEDIA_EXTENSIONS = frozenset(MEDIA_EXTENSION_PRIORITY)  # For constant-time membership checks
+
 
 class ConfigurationError(Exception):
-    """Custom exception for configuration-related errors"""
-    pass
+    """Custom exception for configuration-related errors
+    
+    Attributes:
+        errors (list): The individual validation problems, one message per entry
+    """
+
+    def __init__(self, message, errors=None):
+        super().__init__(message)
+        self.errors = list(errors) if errors else [message]
 
 
 def validate_config():
     """
     Validate all configuration settings and environment variables.
     
+    Returns:
+        bool: True if the configuration is valid
+    
     Raises:
-        ConfigurationError: If configuration is invalid
+        ConfigurationError: If configuration is invalid; its errors attribute lists each problem
     """
     errors = []
     warnings = []
@@ -40,17 +110,25 @@ def validate_config():
     if gemini_key and len(gemini_key) < 20:
         errors.append("Gemini API key appears to be too short")
     
+    requests_per_minute = _ENV.get("GEMINI_REQUESTS_PER_MINUTE")
+    if requests_per_minute and _parse_positive_int(requests_per_minute) is None:
+        errors.append(f"GEMINI_REQUESTS_PER_MINUTE must be a positive whole number, got: {requests_per_minute}")
+    
     if not openai_key and not gemini_key:
         warnings.append("No API keys configured - transcription features will not be available")
     
+    # The download path is checked regardless of API keys since downloads always use it
     # Validate default download path
     default_path = get_default_download_path()
     if default_path:
         try:
-            path_obj = Path(default_path)
-            if not path_obj.exists():
+            # A single access() call covers the common case of an existing, writable path;
+            # only fall back to an existence check to tell the two failures apart
+            if os.access(default_path, os.W_OK):
+                pass
+            elif not os.path.exists(default_path):
                 warnings.append(f"Default download path does not exist: {default_path}")
-            elif not os.access(default_path, os.W_OK):
+            else:
                 errors.append(f"Default download path is not writable: {default_path}")
         except Exception as e:
             errors.append(f"Invalid default download path: {default_path} - {str(e)}")
@@ -61,20 +139,26 @@ def validate_config():
     
     # Raise errors if any
     if errors:
-        error_msg = "Configuration validation failed:\n" + "\n".join(f"- {error}" for error in errors)
-        raise ConfigurationError(error_msg)
+        error_msg = "Configuration validation failed:\n- " + "\n- ".join(errors)
+        raise ConfigurationError(error_msg, errors)
     
     return True
 
 
+@functools.lru_cache(maxsize=1)
 def load_config():
-    """Load configuration settings from environment variables with validation."""
+    """
+    Load configuration settings from environment variables with validation.
+    
+    The configuration is built and validated only once; subsequent calls return
+    the same read-only mapping.
+    """
     
     config = {
         "openai_api_key": get_openai_api_key(),
         "gemini_api_key": get_gemini_api_key(),
         "default_download_path": get_default_download_path(),
-        "media_extensions": ['.mp4', '.mp3', '.m4a', '.webm', '.mkv']
+        "media_extensions": MEDIA_EXTENSIONS
     }
     
     # Validate configuration
@@ -85,18 +169,36 @@ def load_config():
         print(f"\nConfiguration Error: {e}")
         print("\nPlease check your environment variables and configuration.")
     
-    return config
+    return MappingProxyType(config)
 
 # API Keys
 def get_openai_api_key():
     """Get OpenAI API key from environment variables"""
-    return os.environ.get("OPENAI_API_KEY")
+    return _ENV.get("OPENAI_API_KEY")
 
 def get_gemini_api_key():
     """Get Google Gemini API key from environment variables"""
-    return os.environ.get("GEMINI_API_KEY")
+    return _ENV.get("GEMINI_API_KEY")
 
 # Default paths
 def get_default_download_path():
     """Get default download path from environment variables or use current directory"""
-    return os.environ.get("DEFAULT_DOWNLOAD_PATH") or os.getcwd()
\ No newline at end of file
+    return _DEFAULT_DOWNLOAD_PATH
+
+# Gemini settings
+def _parse_positive_int(value):
+    """Return value as a positive int, or None if it isn't one"""
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        return None
+    return number if number > 0 else None
+
+def get_gemini_requests_per_minute():
+    """Get the Gemini request rate limit from environment variables, or the free-tier default"""
+    return _parse_positive_int(_ENV.get("GEMINI_REQUESTS_PER_MINUTE")) or DEFAULT_GEMINI_REQUESTS_PER_MINUTE
+
+# Downloader settings
+def get_use_aria2c():
+    """Get whether single-file HTTP downloads should use aria2c (USE_ARIA2C=1), off by default"""
+    return _ENV.get("USE_ARIA2C", "").strip().lower() in ("1", "true", "yes")
\ No newline at end of file
@@ -5,12 +5,19 @@ Handles downloading videos and audio from YouTube.
 
 import os
 import time
-import yt_dlp
-import threading
-import queue
-import logging
 import json
+import atexit
+import asyncio
+import threading
+import copy
+import shutil
+import functools
+import hashlib
+import tempfile
+from collections import OrderedDict
 from pathlib import Path
+from tqdm import tqdm
+from config import get_use_aria2c
 from utils import find_downloaded_file, DownloadError
 from utils import logging  # Use the logging configuration from utils
 
@@ -19,111 +26,433 @@ DEFAULT_CONNECT_TIMEOUT = 30  # seconds
 DEFAULT_DOWNLOAD_TIMEOUT = 600  # 10 minutes
 DEFAULT_FORMAT_LIST_TIMEOUT = 60  # 1 minute
 
-def list_formats(url, timeout=DEFAULT_FORMAT_LIST_TIMEOUT):
-    """List available formats for a video with timeout handling."""
+# Minimum seconds between progress line updates
+PROGRESS_REFRESH_INTERVAL = 0.5
+
+# Maximum number of downloads run at the same time by the async helpers
+MAX_CONCURRENT_DOWNLOADS = 2
+
+# Number of DASH/HLS fragments fetched in parallel per download
+CONCURRENT_FRAGMENT_DOWNLOADS = 4
+
+# Parallel byte-range connections per file when aria2c is enabled for HTTP downloads.
+# aria2c is opt-in (USE_ARIA2C=1): yt-dlp reports no progress while it runs, so neither
+# the progress bar nor the download timeout can be applied to those downloads.
+RANGE_DOWNLOAD_CONNECTIONS = 8
+ARIA2C_PATH = shutil.which('aria2c') if get_use_aria2c() else None
+
+# Multiplier for converting a byte count to megabytes
+BYTES_TO_MB = 1.0 / (1024 * 1024)
+
+# Raw video info keyed by URL, most recently used last
+INFO_CACHE_SIZE = 128
+_INFO_CACHE = OrderedDict()
+_INFO_CACHE_LOCK = threading.Lock()
+# Raw video info is also kept on disk so repeated runs can skip extraction.
+# Stream URLs in the info expire after a few hours, so entries are only reused briefly.
+INFO_CACHE_DIR = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+                              'youtube-transcriber', 'info')
+INFO_CACHE_TTL = 3600  # Seconds
+
+# YouTube extractors tried before the others, as in yt-dlp's own registry: videos before the
+# fallbacks for truncated URLs, and channel/tab pages before the playlist-only extractor
+YOUTUBE_EXTRACTOR_PRECEDENCE = ('Youtube', 'YoutubeTab')
+
+# Shared YoutubeDL instances keyed by their frozen options
+_YDL_CACHE = {}
+_YDL_CACHE_LOCK = threading.Lock()
+
+
+def _http_retry_sleep(n):
+    """Exponential backoff for HTTP retries, max 30s."""
+    return min(2 ** n, 30)
+
+
+def _fragment_retry_sleep(n):
+    """Exponential backoff for fragment retries, max 10s."""
+    return min(2 ** n, 10)
+
+
+def _freeze_opts(value):
+    """Convert nested yt-dlp option dicts and lists into a hashable cache key."""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze_opts(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze_opts(item) for item in value)
+    return value
+
+
+@functools.lru_cache(maxsize=1)
+def _youtube_extractor_classes():
+    """
+    Return yt-dlp's YouTube extractor classes, followed by the generic one.
+    
+    The classes are collected from yt-dlp's youtube extractor module, so extractors
+    added or renamed by yt-dlp are picked up. Importing that module directly avoids
+    building yt-dlp's full registry of well over a thousand extractors. Extractors
+    referenced by key from a result are still loaded on demand by yt-dlp.
+    
+    Raises:
+        ImportError: If the installed yt-dlp has no YoutubeIE
+    """
+    from yt_dlp.extractor import youtube
+    from yt_dlp.extractor.common import InfoExtractor
+    from yt_dlp.extractor.generic import GenericIE
+
+    # dict.fromkeys drops the aliases the module also binds its classes to
+    classes = list(dict.fromkeys(
+        value for name, value in vars(youtube).items()
+        if name.endswith('IE') and isinstance(value, type) and issubclass(value, InfoExtractor)
+        and value.ie_key().startswith('Youtube') and value._ENABLED
+        and getattr(value, '_VALID_URL', None)  # Base classes have no URL pattern
+    ))
+    if 'Youtube' not in {extractor_class.ie_key() for extractor_class in classes}:
+        raise ImportError("The installed yt-dlp has no YoutubeIE; update yt-dlp with: pip install -U yt-dlp")
+
+    # yt-dlp uses the first suitable extractor, so keep its precedence for overlapping URL patterns
+    precedence = {key: index for index, key in enumerate(YOUTUBE_EXTRACTOR_PRECEDENCE)}
+    classes.sort(key=lambda extractor_class: precedence.get(extractor_class.ie_key(), len(precedence)))
+    classes.append(GenericIE)
+    return tuple(classes)
+
+
+class _SharedYoutubeDL:
+    """A cached YoutubeDL instance with the lock and hook slots of its current user.
+    
+    YoutubeDL keeps mutable per-download state, so callers must hold the lock while
+    using the instance. The instance gets single permanent progress and post hooks that
+    forward to whichever hooks the current caller has set.
+    """
+
+    def __init__(self, ydl_opts):
+        import yt_dlp  # Deferred: importing yt-dlp loads all of its extractors
+
+        self.lock = threading.Lock()
+        self.progress_hook = None
+        self.post_hook = None
+        # Register only the extractors this YouTube downloader needs instead of all of them
+        self.ydl = yt_dlp.YoutubeDL(ydl_opts, auto_init=False)
+        for extractor_class in _youtube_extractor_classes():
+            self.ydl.add_info_extractor(extractor_class())
+        self.ydl.add_progress_hook(self._dispatch_progress)
+        self.ydl.add_post_hook(self._dispatch_post)
+
+    def _dispatch_progress(self, d):
+        """Forward a yt-dlp progress update to the current caller's hook, if any."""
+        if self.progress_hook:
+            self.progress_hook(d)
+
+    def _dispatch_post(self, filepath):
+        """Forward the final path of a finished download to the current caller's hook, if any."""
+        if self.post_hook:
+            self.post_hook(filepath)
+
+
+def _get_shared_ydl(ydl_opts):
+    """Return the shared YoutubeDL wrapper for these options, creating it on first use.
+    
+    Constructing a YoutubeDL sets up extractors, cookies and the network opener, so
+    repeated calls with the same options reuse one instance instead.
+    """
+    key = _freeze_opts(ydl_opts)
+    with _YDL_CACHE_LOCK:
+        shared = _YDL_CACHE.get(key)
+        if shared is None:
+            shared = _SharedYoutubeDL(ydl_opts)
+            _YDL_CACHE[key] = shared
+        return shared
 
-    def _list_formats(formats_queue, timeout_seconds):
-        """Helper function to list formats in a thread with timeout."""
-        try:
-            # Configure yt-dlp with timeout settings
-            ydl_opts = {
-                'listformats': True, 
-                'quiet': True,
-                'socket_timeout': timeout_seconds,
-                'retries': 2,
-                'fragment_retries': 2,
-            }
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=False)
-                formats_queue.put(("success", info))
-        except Exception as e:
-            formats_queue.put(("error", str(e)))
 
+@atexit.register
+def _close_shared_ydls():
+    """Close all cached YoutubeDL instances, saving cookies and closing connections."""
+    with _YDL_CACHE_LOCK:
+        for shared in _YDL_CACHE.values():
+            try:
+                shared.ydl.close()
+            except Exception as e:
+                logging.warning(f"Error closing yt-dlp instance: {e}")
+        _YDL_CACHE.clear()
+
+
+def _info_cache_file(url):
+    """Return the path of the on-disk info cache entry for a URL."""
+    return os.path.join(INFO_CACHE_DIR, hashlib.sha1(url.encode('utf-8')).hexdigest() + '.json')
+
+
+def _read_info_file(url):
+    """Return the raw info cached on disk for a URL, or None if it is missing or stale.
+    
+    A stale entry is deleted when it is found.
+    """
+    cache_file = _info_cache_file(url)
     try:
-        print(f"\nListing available formats (timeout: {timeout}s)...")
-        formats_queue = queue.Queue()
-        format_thread = threading.Thread(target=_list_formats, args=(formats_queue, timeout))
-        format_thread.daemon = True
-        format_thread.start()
-
-        # Show a loading indicator with progress
-        print("Fetching formats", end="")
-        start_time = time.time()
-        while format_thread.is_alive():
-            elapsed = time.time() - start_time
-            if elapsed > timeout:
-                print(f"\n\nTimeout after {timeout} seconds while fetching formats.")
-                print("This may be due to network issues or the video being unavailable.")
-                return False
-            
-            print(".", end="", flush=True)
-            time.sleep(0.5)
-        print()
+        if time.time() - os.stat(cache_file).st_mtime > INFO_CACHE_TTL:
+            os.unlink(cache_file)
+            return None
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _prune_info_cache():
+    """Delete on-disk info cache entries, and leftover temporary files, older than INFO_CACHE_TTL."""
+    cutoff = time.time() - INFO_CACHE_TTL
+    try:
+        with os.scandir(INFO_CACHE_DIR) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_file() and entry.stat().st_mtime < cutoff:
+                        os.unlink(entry.path)
+                except OSError:
+                    pass  # Removed by another process, or not ours to delete
+    except OSError as e:
+        logging.debug(f"Could not prune info cache: {str(e)}")
+
 
-        # Get the result with a short timeout
+def _write_info_file(ydl, url, info):
+    """Store raw info on disk for later runs, pruning expired entries.
+    
+    Failures are logged and otherwise ignored.
+    """
+    # Playlist entries are extracted lazily and can't be serialized without fetching them all
+    if info.get('_type', 'video') != 'video':
+        return
+    try:
+        os.makedirs(INFO_CACHE_DIR, exist_ok=True)
+        # Write to a temporary file first so a concurrent reader never sees a partial entry
+        fd, temp_path = tempfile.mkstemp(dir=INFO_CACHE_DIR, suffix='.tmp')
         try:
-            status, result = formats_queue.get(timeout=5)
-            if status == "error":
-                logging.error(f"Error listing formats: {result}")
-                print(f"Error listing formats: {result}")
-                return False
-            return True
-        except queue.Empty:
-            print("Timeout waiting for format listing result.")
-            return False
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(ydl.sanitize_info(info), f)
+            os.replace(temp_path, _info_cache_file(url))
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+    except (OSError, TypeError, ValueError) as e:
+        logging.debug(f"Could not write info cache for {url}: {str(e)}")
+        return
+    # Entries for URLs that are never requested again would otherwise stay forever
+    _prune_info_cache()
 
-    except Exception as e:
-        logging.exception("Error during format listing")
-        print(f"Error listing formats: {str(e)}")
-        return False
 
-def _download_with_progress(ydl, url, download_queue, timeout_seconds):
-    """Helper function to download media in a thread with timeout handling.
+def _extract_info_cached(ydl, url):
+    """
+    Extract raw (unprocessed) video info for a URL, reusing a cached result when available.
+    
+    Extraction is the expensive network step (webpage, player and signature handling);
+    format selection happens later in process_ie_result and is cheap. Results are cached
+    in memory and, for INFO_CACHE_TTL seconds, on disk across runs. Callers must pass
+    a deep copy of the returned dict to process_ie_result, since processing mutates it.
+    
+    Args:
+        ydl (yt_dlp.YoutubeDL): The instance to extract with on a cache miss
+        url (str): The video URL
+        
+    Returns:
+        dict: The raw info dict, or None if yt-dlp ignored an extraction error
+    """
+    with _INFO_CACHE_LOCK:
+        info = _INFO_CACHE.get(url)
+        if info is not None:
+            _INFO_CACHE.move_to_end(url)
+            return info
+
+    info = _read_info_file(url)
+    if info is None:
+        info = ydl.extract_info(url, download=False, process=False)
+        if info is not None:
+            _write_info_file(ydl, url, info)
+    if info is not None:
+        with _INFO_CACHE_LOCK:
+            _INFO_CACHE[url] = info
+            while len(_INFO_CACHE) > INFO_CACHE_SIZE:
+                _INFO_CACHE.popitem(last=False)
+    return info
+
+
+def extract_video_info(url, connect_timeout=DEFAULT_CONNECT_TIMEOUT):
+    """
+    Fetch and cache the raw info for a video so later downloads can skip extraction.
+    
+    Args:
+        url (str): The video URL
+        connect_timeout (int): Timeout in seconds for network connections
+        
+    Returns:
+        dict: The raw info dict to pass as download_media's info argument
+        
+    Raises:
+        DownloadError: If no video information could be retrieved
+    """
+    ydl_opts = {
+        'quiet': True,
+        'socket_timeout': connect_timeout,
+        'retries': 3,
+    }
+    shared = _get_shared_ydl(ydl_opts)
+    with shared.lock:
+        info = _extract_info_cached(shared.ydl, url)
+    if info is None:
+        raise DownloadError(f"Could not fetch video information for {url}")
+    return info
+
+
+def list_formats(url, timeout=DEFAULT_FORMAT_LIST_TIMEOUT):
+    """List available formats for a video with timeout handling.
     
-    Note: Timeout is handled by the calling thread that monitors this function's execution.
-    This approach works cross-platform (Windows, Unix, macOS) unlike signal-based timeouts.
+    The call runs synchronously; yt-dlp enforces the timeout itself through its
+    socket_timeout option, so no watchdog thread is needed.
     """
+    # Configure yt-dlp with timeout settings
+    ydl_opts = {
+        'listformats': True, 
+        'quiet': True,
+        'socket_timeout': timeout,
+        'retries': 2,
+        'fragment_retries': 2,
+    }
+
     try:
-        ydl.download([url])
-        download_queue.put(("success", None))
-                
-    except json.JSONDecodeError as e:
-        # Handle JSON parsing error specifically
-        logging.error(f"JSON parsing error during download: {str(e)}")
-        download_queue.put(("error", f"Error parsing YouTube response. Try another format or video."))
+        print(f"\nListing available formats (timeout: {timeout}s)...")
+        shared = _get_shared_ydl(ydl_opts)
+        with shared.lock:
+            info = _extract_info_cached(shared.ydl, url)
+            if info is None:
+                raise DownloadError(f"Could not fetch video information for {url}")
+            # Processing the info with listformats set prints the format table
+            shared.ydl.process_ie_result(copy.deepcopy(info), download=False)
+        return True
+
     except Exception as e:
-        download_queue.put(("error", str(e)))
+        error_msg = str(e)
+        if isinstance(e, TimeoutError) or "timed out" in error_msg.lower():
+            print(f"\nTimeout after {timeout} seconds while fetching formats.")
+            print("This may be due to network issues or the video being unavailable.")
+            return False
+        logging.error(f"Error listing formats: {error_msg}")
+        print(f"Error listing formats: {error_msg}")
+        return False
+
+async def list_formats_async(url, timeout=DEFAULT_FORMAT_LIST_TIMEOUT):
+    """Asyncio variant of list_formats that runs the listing in a worker thread."""
+    return await asyncio.to_thread(list_formats, url, timeout)
+
+def _make_progress_hook(download_timeout, show_progress=True, progress_callback=None,
+                        progress_position=None):
+    """Create a yt-dlp progress hook that reports progress and enforces the download timeout.
+    
+    yt-dlp calls the hook on every received chunk, so no separate monitoring thread is
+    needed. Raising from the hook aborts the download, which is how the overall timeout
+    is enforced. This works cross-platform (Windows, Unix, macOS) unlike signal-based timeouts.
+    Progress is rendered as a tqdm bar per file, placed on line progress_position when
+    several downloads run at once. If given, progress_callback receives every yt-dlp
+    progress dict unthrottled.
+    """
+    start_time = time.time()
+    bar = [None]  # tqdm bar of the file currently being downloaded
+
+    def _close_bar():
+        if bar[0] is not None:
+            bar[0].close()
+            bar[0] = None
+
+    def _progress_hook(d):
+        # A download that has already finished is kept, however long it took
+        if d.get('status') != 'finished' and time.time() - start_time > download_timeout:
+            _close_bar()
+            print(f"\n\nDownload timed out after {download_timeout} seconds.")
+            print("This may be due to:")
+            print("- Slow internet connection")
+            print("- Large file size")
+            print("- Network issues")
+            print("- Server problems")
+            raise DownloadError(f"Download timeout after {download_timeout} seconds")
+
+        if progress_callback:
+            progress_callback(d)
+
+        if not show_progress:
+            return
+
+        status = d.get('status')
+        if status == 'downloading':
+            total = d.get('total_bytes') or d.get('total_bytes_estimate')
+            if bar[0] is None:
+                # tqdm throttles redraws itself, so the hook can update it on every chunk
+                bar[0] = tqdm(total=total, unit='B', unit_scale=True, unit_divisor=1024,
+                              desc="Downloading", position=progress_position,
+                              leave=progress_position is None,
+                              mininterval=PROGRESS_REFRESH_INTERVAL)
+            elif total and bar[0].total != total:
+                bar[0].total = total
+            bar[0].update((d.get('downloaded_bytes') or 0) - bar[0].n)
+        elif status in ('finished', 'error'):
+            _close_bar()
+
+    return _progress_hook
+
+def _build_download_opts(ydl_opts, connect_timeout=DEFAULT_CONNECT_TIMEOUT):
+    """Return a copy of ydl_opts with the timeout, retry and downloader settings used for all downloads."""
+    # Add timeout configurations to yt-dlp options
+    enhanced_opts = ydl_opts.copy()
+    enhanced_opts.update({
+        'socket_timeout': connect_timeout,
+        'noprogress': True,  # Progress is rendered by our own progress hook
+        'retries': 3,
+        'fragment_retries': 3,
+        # Fetch DASH/HLS fragments in parallel over yt-dlp's pooled connections
+        'concurrent_fragment_downloads': CONCURRENT_FRAGMENT_DOWNLOADS,
+        'retry_sleep_functions': {
+            'http': _http_retry_sleep,
+            'fragment': _fragment_retry_sleep,
+        }
+    })
+
+    # Split single-file HTTP downloads into parallel byte ranges when aria2c is enabled;
+    # DASH/HLS fragments stay with yt-dlp's native downloader
+    if ARIA2C_PATH and 'external_downloader' not in ydl_opts:
+        connections = str(RANGE_DOWNLOAD_CONNECTIONS)
+        enhanced_opts['external_downloader'] = {'http': 'aria2c'}
+        enhanced_opts['external_downloader_args'] = {
+            'aria2c': ['-x', connections, '-s', connections, '-k', '1M'],
+        }
+
+    return enhanced_opts
 
 def download_media(url, ydl_opts, download_type, download_path, 
                   connect_timeout=DEFAULT_CONNECT_TIMEOUT, 
-                  download_timeout=DEFAULT_DOWNLOAD_TIMEOUT):
-    """Download media with comprehensive timeout handling and progress monitoring."""
+                  download_timeout=DEFAULT_DOWNLOAD_TIMEOUT,
+                  show_progress=True, info=None, progress_callback=None, progress_position=None):
+    """Download media with comprehensive timeout handling and progress monitoring.
+    
+    Set show_progress to False to suppress the progress bar. When several downloads
+    run concurrently, give each a distinct progress_position so their bars don't overlap.
+    Pass the raw info from extract_video_info as info to skip metadata extraction;
+    otherwise it is extracted here, or taken from the cache of earlier calls.
+    progress_callback, if given, is called with each yt-dlp progress dict.
+    """
+    import yt_dlp  # Deferred: importing yt-dlp loads all of its extractors
 
     try:
-        # Add timeout configurations to yt-dlp options
-        enhanced_opts = ydl_opts.copy()
-        enhanced_opts.update({
-            'socket_timeout': connect_timeout,
-            'retries': 3,
-            'fragment_retries': 3,
-            'retry_sleep_functions': {
-                'http': lambda n: min(2 ** n, 30),  # Exponential backoff, max 30s
-                'fragment': lambda n: min(2 ** n, 10),  # Exponential backoff, max 10s
-            }
-        })
-
-        with yt_dlp.YoutubeDL(enhanced_opts) as ydl:
+        enhanced_opts = _build_download_opts(ydl_opts, connect_timeout)
+
+        shared = _get_shared_ydl(enhanced_opts)
+        with shared.lock:
+            ydl = shared.ydl
+            shared.progress_hook = None
+            shared.post_hook = None
             print(f"Fetching video information (timeout: {connect_timeout}s)...")
             
-            # Get video info with timeout
-            info_start = time.time()
-            try:
-                info = ydl.extract_info(url, download=False)
-            except Exception as e:
-                if time.time() - info_start > connect_timeout:
-                    raise DownloadError(f"Timeout while fetching video information after {connect_timeout}s")
-                raise e
-                
+            # Network timeouts are enforced by socket_timeout and surface as yt-dlp errors
+            if info is None:
+                info = _extract_info_cached(ydl, url)
+            if info is None:
+                raise DownloadError(f"Could not fetch video information for {url}")
+            # Select formats for these options on a private copy of the shared raw info
+            info = ydl.process_ie_result(copy.deepcopy(info), download=False)
+
             title = info.get('title', 'Unknown title')
             duration = info.get('duration', 'Unknown')
             view_count = info.get('view_count', 'Unknown')
@@ -136,60 +465,33 @@ def download_media(url, ydl_opts, download_type, download_path,
             logging.info(f"Downloading: {title}, Duration: {duration}s, Views: {view_count}")
 
             filename = ydl.prepare_filename(info)
-            if download_type == "audio":
-                file_path = Path(filename)
-                filename = str(file_path.with_suffix(".mp3"))
+            # Audio extraction to a fixed codec changes the extension; 'best' keeps the source one
+            audio_codec = _audio_extraction_codec(ydl_opts)
+            if download_type == "audio" and audio_codec and audio_codec != 'best':
+                filename = os.path.splitext(filename)[0] + "." + audio_codec
 
             print(f"\nStarting {download_type} download (timeout: {download_timeout}s)...")
             print(f"File will be saved as: {filename}")
 
-            download_queue = queue.Queue()
-            download_thread = threading.Thread(
-                target=_download_with_progress, 
-                args=(ydl, url, download_queue, download_timeout)
-            )
-            download_thread.daemon = True
-            download_thread.start()
-
-            # Monitor download progress with timeout
-            print("Downloading", end="")
-            start_time = time.time()
-            interval = 1.0
-            last_dot_time = start_time
-            
-            while download_thread.is_alive():
-                current_time = time.time()
-                elapsed = current_time - start_time
-                
-                # Check for overall timeout
-                if elapsed > download_timeout:
-                    print(f"\n\nDownload timed out after {download_timeout} seconds.")
-                    print("This may be due to:")
-                    print("- Slow internet connection")
-                    print("- Large file size")
-                    print("- Network issues")
-                    print("- Server problems")
-                    raise DownloadError(f"Download timeout after {download_timeout} seconds")
-                
-                # Show progress dots
-                if current_time - last_dot_time >= interval:
-                    print(".", end="", flush=True)
-                    last_dot_time = current_time
-                
-                time.sleep(0.1)
-            print()
-            
-            # Get download result with timeout
+            # Download on this thread; the progress hook reports progress and enforces the timeout.
+            # The already extracted info is processed directly so metadata is not fetched twice.
+            shared.progress_hook = _make_progress_hook(download_timeout, show_progress, progress_callback,
+                                                        progress_position)
+            # yt-dlp reports the exact final path (after postprocessing) through the post hook
+            final_paths = []
+            shared.post_hook = final_paths.append
             try:
-                status, error = download_queue.get(timeout=10)
-                if status == "timeout":
-                    raise DownloadError(f"Download operation timed out: {error}")
-                elif status == "error":
-                    raise DownloadError(error)
-            except queue.Empty:
-                raise DownloadError("Download failed: No response from download thread")
-
-            downloaded_file_path = find_downloaded_file(filename, download_path)
+                ydl.process_ie_result(info, download=True)
+            except json.JSONDecodeError as e:
+                # Handle JSON parsing error specifically
+                logging.error(f"JSON parsing error during download: {str(e)}")
+                raise DownloadError("Error parsing YouTube response. Try another format or video.")
+
+            # Only search the download directory if yt-dlp didn't report an existing file
+            if final_paths and os.path.exists(final_paths[-1]):
+                downloaded_file_path = final_paths[-1]
+            else:
+                downloaded_file_path = find_downloaded_file(filename, download_path)
             _log_and_print_download_status(download_type, downloaded_file_path)
 
             return downloaded_file_path
@@ -208,58 +510,210 @@ def download_media(url, ydl_opts, download_type, download_path,
         from utils import GenericError
         raise GenericError(f"Download failed: {str(e)}")
 
+def download_batch(urls, ydl_opts, connect_timeout=DEFAULT_CONNECT_TIMEOUT,
+                   download_timeout=DEFAULT_DOWNLOAD_TIMEOUT, show_progress=True):
+    """
+    Download several URLs with one yt-dlp call, sharing its extractor state and connections.
+    
+    Errors on individual URLs are logged by yt-dlp and skipped so the rest of the batch
+    still downloads.
+    
+    Args:
+        urls (list): The video URLs to download
+        ydl_opts (dict): Base yt-dlp options, e.g. format, outtmpl and postprocessors
+        connect_timeout (int): Timeout in seconds for network connections
+        download_timeout (int): Timeout in seconds for the whole batch
+        show_progress (bool): Whether to print download progress
+        
+    Returns:
+        list: Final paths of the files that were downloaded, in completion order
+    """
+    enhanced_opts = _build_download_opts(ydl_opts, connect_timeout)
+    enhanced_opts['ignoreerrors'] = True
+
+    downloaded_files = []
+    shared = _get_shared_ydl(enhanced_opts)
+    with shared.lock:
+        shared.progress_hook = _make_progress_hook(download_timeout, show_progress)
+        shared.post_hook = downloaded_files.append
+        try:
+            shared.ydl.download(list(urls))
+        finally:
+            shared.progress_hook = None
+            shared.post_hook = None
+
+    logging.info(f"Batch download finished: {len(downloaded_files)} file(s) from {len(urls)} URL(s)")
+    return downloaded_files
+
+async def download_media_async(url, ydl_opts, download_type, download_path,
+                               connect_timeout=DEFAULT_CONNECT_TIMEOUT,
+                               download_timeout=DEFAULT_DOWNLOAD_TIMEOUT,
+                               show_progress=True, info=None, progress_queue=None,
+                               progress_position=None):
+    """Asyncio variant of download_media that runs the download in a worker thread.
+    
+    This lets callers await several downloads together with asyncio.gather. The
+    timeouts are still enforced by download_media itself, since a running yt-dlp
+    download cannot be cancelled from the event loop.
+    
+    If progress_queue (an asyncio.Queue) is given, yt-dlp progress dicts are put on
+    it from the event loop so a consumer task can render them. Updates are dropped
+    while the queue is full, so a slow consumer never stalls the download.
+    """
+    progress_callback = None
+    if progress_queue is not None:
+        loop = asyncio.get_running_loop()
+
+        def _put_progress(d):
+            try:
+                progress_queue.put_nowait(d)
+            except asyncio.QueueFull:
+                pass
+
+        def _forward_progress(d):
+            loop.call_soon_threadsafe(_put_progress, dict(d))
+
+        progress_callback = _forward_progress
+
+    return await asyncio.to_thread(download_media, url, ydl_opts, download_type, download_path,
+                                   connect_timeout, download_timeout, show_progress, info,
+                                   progress_callback, progress_position)
+
 def _log_and_print_download_status(download_type, downloaded_file_path):
     """Log and print download completion status."""
 
     if downloaded_file_path:
-        file_path = Path(downloaded_file_path)
-        if file_path.exists():
-            file_size = file_path.stat().st_size / (1024 * 1024)  # Size in MB
+        # A single stat both checks existence and yields the size
+        try:
+            file_size = os.stat(downloaded_file_path).st_size * BYTES_TO_MB
+        except FileNotFoundError:
+            file_size = None
+        if file_size is not None:
             print(f"\n{download_type.capitalize()} download completed successfully!")
-            print(f"File saved at: {file_path} (Size: {file_size:.2f} MB)")
-            logging.info(f"Download successful: {file_path} (Size: {file_size:.2f} MB)")
+            print(f"File saved at: {downloaded_file_path} (Size: {file_size:.2f} MB)")
+            logging.info(f"Download successful: {downloaded_file_path} (Size: {file_size:.2f} MB)")
             return
     
     logging.warning(f"Expected file not found after download")
     print(f"\nWARNING: Expected file not found after download.")
 
-def download_video_audio_separately(url, download_path, 
-                                   connect_timeout=DEFAULT_CONNECT_TIMEOUT,
-                                   download_timeout=DEFAULT_DOWNLOAD_TIMEOUT):
-    """Download video and audio as separate files with timeout handling."""
+def _audio_extraction_codec(ydl_opts):
+    """Return the preferredcodec of the FFmpegExtractAudio postprocessor in ydl_opts, or None."""
+    for postprocessor in ydl_opts.get('postprocessors', []):
+        if postprocessor.get('key') == 'FFmpegExtractAudio':
+            return postprocessor.get('preferredcodec', 'best')
+    return None
 
-    try:
-        from pathlib import Path
-        download_dir = Path(download_path)
-        
-        video_opts = {
-            'format': 'bestvideo[ext=mp4]/best[ext=mp4]/best',
-            'outtmpl': str(download_dir / '%(title)s_video.%(ext)s'),
-            'verbose': False,
-            'ignoreerrors': True,
-            'no_warnings': False,
+def _separate_download_opts(download_path, transcode_to_mp3=False):
+    """Build the yt-dlp options for the video-only and audio-only files of a separate download.
+    
+    Unless transcode_to_mp3 is set, the audio is saved as M4A, which every transcription
+    service accepts. An AAC stream is preferred since it is copied without a CPU-bound
+    re-encode; other codecs are converted to AAC.
+    """
+    download_dir = Path(download_path)
+    
+    video_opts = {
+        'format': 'bestvideo[ext=mp4]/best[ext=mp4]/best',
+        'outtmpl': str(download_dir / '%(title)s_video.%(ext)s'),
+        'verbose': False,
+        'ignoreerrors': True,
+        'no_warnings': False,
+    }
+    if transcode_to_mp3:
+        audio_format = 'bestaudio/best'
+        audio_postprocessor = {
+            'key': 'FFmpegExtractAudio',
+            'preferredcodec': 'mp3',
+            'preferredquality': '192',
         }
-        print("\nDownloading video file first...")
-        video_path = download_media(url, video_opts, "video", download_path, 
-                                  connect_timeout, download_timeout)
-
-        audio_opts = {
-            'format': 'bestaudio/best',
-            'postprocessors': [{
-                'key': 'FFmpegExtractAudio',
-                'preferredcodec': 'mp3',
-                'preferredquality': '192',
-            }],
-            'outtmpl': str(download_dir / '%(title)s_audio.%(ext)s'),
-            'verbose': False,
-            'ignoreerrors': True,
-            'no_warnings': False,
+    else:
+        audio_format = 'bestaudio[ext=m4a]/bestaudio/best'
+        audio_postprocessor = {
+            'key': 'FFmpegExtractAudio',
+            'preferredcodec': 'm4a',  # AAC streams are copied, not re-encoded
         }
-        print("\nDownloading audio file second...")
-        audio_path = download_media(url, audio_opts, "audio", download_path,
-                                  connect_timeout, download_timeout)
+    audio_opts = {
+        'format': audio_format,
+        'postprocessors': [audio_postprocessor],
+        'outtmpl': str(download_dir / '%(title)s_audio.%(ext)s'),
+        'verbose': False,
+        'ignoreerrors': True,
+        'no_warnings': False,
+    }
+    return video_opts, audio_opts
+
+async def download_video_audio_separately_async(url, download_path,
+                                               connect_timeout=DEFAULT_CONNECT_TIMEOUT,
+                                               download_timeout=DEFAULT_DOWNLOAD_TIMEOUT,
+                                               semaphore=None, transcode_to_mp3=False,
+                                               show_progress=True):
+    """Download video and audio as separate files concurrently with asyncio.gather.
+    
+    Args:
+        url (str): The YouTube video URL
+        download_path (str): Directory to save the files in
+        connect_timeout (int): Timeout in seconds for network connections
+        download_timeout (int): Timeout in seconds for each download
+        semaphore (asyncio.Semaphore, optional): Limits concurrent downloads when shared
+            across several calls. Defaults to a new MAX_CONCURRENT_DOWNLOADS semaphore.
+        transcode_to_mp3 (bool): Re-encode the audio to MP3 instead of saving it as M4A
+        show_progress (bool): Whether to show a progress bar for each of the two downloads
+        
+    Returns:
+        tuple: (video_path, audio_path), either of which may be None if not found
+    """
+    video_opts, audio_opts = _separate_download_opts(download_path, transcode_to_mp3)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_DOWNLOADS)
+
+    # Extract the video info once and share it, instead of once per download
+    info = await asyncio.to_thread(extract_video_info, url, connect_timeout)
+
+    async def _limited_download(opts, download_type, position):
+        async with semaphore:
+            return await download_media_async(url, opts, download_type, download_path,
+                                              connect_timeout, download_timeout, show_progress,
+                                              info, progress_position=position)
+
+    # Each download renders its own progress bar on a separate line
+    video_path, audio_path = await asyncio.gather(
+        _limited_download(video_opts, "video", 0),
+        _limited_download(audio_opts, "audio", 1),
+    )
+    return video_path, audio_path
 
-        return video_path, audio_path
+async def download_many(urls, download_path,
+                        connect_timeout=DEFAULT_CONNECT_TIMEOUT,
+                        download_timeout=DEFAULT_DOWNLOAD_TIMEOUT):
+    """Download video and audio separately for several URLs, sharing one concurrency limit.
+    
+    Returns:
+        list: One (video_path, audio_path) tuple per URL, in the same order as urls
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_DOWNLOADS)
+    # Progress bars are per URL, so they are left off rather than overlapping across URLs
+    return await asyncio.gather(*(
+        download_video_audio_separately_async(url, download_path, connect_timeout,
+                                              download_timeout, semaphore, show_progress=False)
+        for url in urls
+    ))
+
+def download_video_audio_separately(url, download_path, 
+                                   connect_timeout=DEFAULT_CONNECT_TIMEOUT,
+                                   download_timeout=DEFAULT_DOWNLOAD_TIMEOUT,
+                                   transcode_to_mp3=False):
+    """Download video and audio as separate files with timeout handling.
+    
+    Both downloads are independent and network-bound, so they run concurrently.
+    The audio is saved as M4A unless transcode_to_mp3 is set.
+    """
+
+    try:
+        print("\nDownloading video and audio files in parallel...")
+        return asyncio.run(download_video_audio_separately_async(url, download_path,
+                                                                 connect_timeout, download_timeout,
+                                                                 transcode_to_mp3=transcode_to_mp3))
 
     except DownloadError as e:
         logging.error(f"Download error during separate download: {str(e)}")
@@ -268,4 +722,4 @@ def download_video_audio_separately(url, download_path,
         logging.exception("Error downloading video/audio separately")
         print(f"\nAn unexpected error occurred during separate download: {str(e)}")
         from utils import GenericError
-        raise GenericError(f"Separate download failed: {str(e)}")
\ No newline at end of file
+        raise GenericError(f"Separate download failed: {str(e)}")
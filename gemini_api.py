@@ -4,33 +4,147 @@ Handles audio processing, transcription, and interactions using Google's Gemini
 """
 
 import os
+import re
+import json
+import datetime
+import sys
+import time
+import random
+import itertools
+import shutil
+import asyncio
+import atexit
+import tempfile
+import subprocess
+import threading
+import functools
+import importlib.util
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-import base64
+from types import MappingProxyType
 import psutil  # For memory monitoring
 from utils import get_api_key_securely, logging, APIError, FilesystemError
-from config import GEMINI_MODEL_FLASH, GEMINI_MODEL_PRO
+from config import GEMINI_MODEL_FLASH, GEMINI_MODEL_PRO, get_gemini_requests_per_minute
 
-# Import Gemini API library
+# Check for the Gemini API library without importing it; the import takes about half
+# a second, so it is deferred until Gemini is actually used (see _import_genai)
 try:
-    import google.generativeai as genai
-
-    GEMINI_AVAILABLE = True
+    GEMINI_AVAILABLE = importlib.util.find_spec("google.generativeai") is not None
 except ImportError:
     GEMINI_AVAILABLE = False
+genai = None
+
+# Instruction sent along with the audio for transcription
+TRANSCRIPTION_PROMPT = "Generate a complete and accurate transcript."
+
+# Maximum number of files or segments transcribed at once, to stay within Gemini rate limits
+MAX_CONCURRENT_TRANSCRIPTIONS = 4
+MAX_REQUESTS_PER_MINUTE = get_gemini_requests_per_minute()  # Set with GEMINI_REQUESTS_PER_MINUTE
+REQUEST_BURST_SIZE = 4  # Requests that may be sent back to back before the rate applies
+
+# Long audio is split into segments of this length, transcribed in parallel
+TRANSCRIPTION_SEGMENT_SECONDS = 300
+FFMPEG_PATH = shutil.which('ffmpeg')
+FFPROBE_PATH = shutil.which('ffprobe')  # Finds the duration, so short audio is not remuxed
+
+# Retries with exponential backoff for rate-limited or temporarily failing requests
+API_RETRY_ATTEMPTS = 3
+API_RETRY_BASE_DELAY = 1  # Seconds
+API_RETRY_MAX_DELAY = 30  # Seconds
+API_RETRY_JITTER = 0.25  # Up to this many seconds are added so parallel retries spread out
+_RETRYABLE_ERROR_PATTERN = re.compile(r"\b(?:429|500|503|504)\b|quota|rate limit|resource.?exhausted|"
+                                      r"unavailable|timeout|timed out|deadline|server error",
+                                      re.IGNORECASE)
+
+# Seconds between status checks while an uploaded file is processed by the Files API
+FILE_PROCESSING_POLL_INTERVAL = 2
+
+# MIME types of the audio formats Gemini accepts, keyed by lower-case file extension
+AUDIO_MIME_TYPES = MappingProxyType({
+    '.mp3': 'audio/mpeg',
+    '.wav': 'audio/wav',
+    '.m4a': 'audio/mp4',
+    '.aac': 'audio/aac',
+    '.ogg': 'audio/ogg',
+    '.opus': 'audio/ogg',
+    '.flac': 'audio/flac',
+    '.aiff': 'audio/aiff',
+})
+
+# System instruction for chat sessions; {content_type} is 'transcript' or 'audio'
+CHAT_SYSTEM_INSTRUCTION = ("You are an AI assistant for a {content_type}. "
+                           "Answer questions based only on the information in the {content_type}.")
+
+# Lifetime of a chat's context cache; it is deleted when the chat ends, this only
+# bounds how long it lingers (and is billed) if the program exits abnormally
+CHAT_CACHE_TTL = datetime.timedelta(hours=1)
+
+# Uploaded transcripts, reused by path while the file is unchanged (least recently used first)
+TRANSCRIPT_UPLOAD_CACHE_SIZE = 8
+_uploaded_transcripts = OrderedDict()  # path -> ((mtime_ns, size), uploaded file)
+_uploaded_transcripts_lock = threading.Lock()
+
+# Runs work that can overlap with waiting for user input
+_background_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="gemini-background")
+
+# Output files are written through a large buffer so long transcripts take few write calls
+OUTPUT_BUFFER_SIZE = 1 << 20
+
+# Set once the API key has been configured and validated, so later calls skip the round-trip
+_gemini_configured = False
+_gemini_configure_lock = threading.Lock()  # The key lookup may prompt the user
+
+
+class _TokenBucket:
+    """
+    Thread-safe token bucket that limits how often requests are sent.
+    
+    Tokens refill continuously at the given rate up to capacity. Each request
+    reserves a token; if none is left, the caller waits until its token would
+    have refilled. It can be used from threads and from event loops alike.
+    """
 
-# Import cross-platform file locking
-try:
-    import portalocker
-    FILE_LOCKING_AVAILABLE = True
-except ImportError:
-    FILE_LOCKING_AVAILABLE = False
-    logging.warning("portalocker not available - file locking will be disabled")
+    def __init__(self, requests_per_minute, capacity):
+        self.rate = requests_per_minute / 60  # Tokens per second
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self):
+        """Take a token and return how many seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate)
+            self._last_refill = now
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+
+    def acquire(self):
+        """Block until a request may be sent."""
+        delay = self._reserve()
+        if delay:
+            time.sleep(delay)
+
+    async def acquire_async(self):
+        """Wait without blocking the event loop until a request may be sent."""
+        delay = self._reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+
+# Shared by every Gemini request, since they all count against the same project quota
+_request_rate_limiter = _TokenBucket(MAX_REQUESTS_PER_MINUTE, REQUEST_BURST_SIZE)
 
 
 def _check_gemini_availability():
     """
     Check if Gemini API is available and configured with valid API key.
     
+    The key is configured and validated with a test request only on the first
+    successful call; later calls return immediately.
+    
     Returns:
         bool: True if Gemini API is available and configured properly
         
@@ -43,6 +157,31 @@ def _check_gemini_availability():
         raise ImportError("Google Gemini API library is not installed. "
                         "Install with: pip install google-generativeai")
     
+    _import_genai()
+    with _gemini_configure_lock:
+        if not _gemini_configured:
+            _configure_gemini()
+    return True
+
+
+def _import_genai():
+    """Import the Gemini API library into the module-level genai name on first use."""
+    global genai
+    if genai is None:
+        import google.generativeai
+        genai = google.generativeai
+    return genai
+
+
+def _configure_gemini():
+    """
+    Configure the Gemini API with the user's key and verify it with a test request.
+    
+    Raises:
+        APIError: If no valid API key is provided or key format is invalid
+    """
+    global _gemini_configured
+    
     # Get the API key
     api_key = get_api_key_securely("gemini")
     
@@ -60,16 +199,16 @@ def _check_gemini_availability():
     # Perform actual API test to verify connectivity and key validity
     try:
         print("Validating Gemini API key...")
-        model = genai.GenerativeModel(GEMINI_MODEL_FLASH)
+        model = _get_model(GEMINI_MODEL_FLASH)
         
         # Make a minimal test request to verify the key works
-        test_response = model.generate_content("Hello")
+        test_response = _call_with_retry(model.generate_content, "Hello")
         
         if not test_response or not test_response.text:
             raise APIError("Gemini API key validation failed: Empty response from test request")
             
         print("✅ Gemini API key validated successfully")
-        return True
+        _gemini_configured = True
         
     except Exception as e:
         error_msg = str(e)
@@ -82,7 +221,136 @@ def _check_gemini_availability():
         else:
             raise APIError(f"Gemini API validation error: {error_msg}")
 
-    return True
+
+@functools.lru_cache(maxsize=4)
+def _get_model(model_name, system_instruction=None):
+    """
+    Return a shared GenerativeModel for the given model name and system instruction.
+    
+    Models hold no per-conversation state (chats keep their own history),
+    so one instance per configuration is reused across calls.
+    
+    Args:
+        model_name (str): Name of the Gemini model
+        system_instruction (str, optional): System instruction for the model. Defaults to None.
+        
+    Returns:
+        genai.GenerativeModel: The model instance
+    """
+    return genai.GenerativeModel(model_name, system_instruction=system_instruction)
+
+
+def _upload_file(file_path, mime_type):
+    """
+    Upload a file to the Gemini Files API and wait until it can be used in requests.
+    
+    Args:
+        file_path (str): Path to the file to upload
+        mime_type (str): MIME type of the file
+        
+    Returns:
+        genai.types.File: The uploaded file, ready to be passed in request contents
+        
+    Raises:
+        APIError: If Gemini could not process the uploaded file
+    """
+    uploaded_file = genai.upload_file(path=file_path, mime_type=mime_type)
+    
+    # Uploaded media is processed server-side before it can be used in a request
+    while uploaded_file.state.name == "PROCESSING":
+        time.sleep(FILE_PROCESSING_POLL_INTERVAL)
+        uploaded_file = genai.get_file(uploaded_file.name)
+    if uploaded_file.state.name != "ACTIVE":
+        _delete_uploaded_file(uploaded_file)
+        raise APIError(f"Gemini could not process the uploaded file (state: {uploaded_file.state.name})")
+    return uploaded_file
+
+
+def _delete_uploaded_file(uploaded_file):
+    """Delete a file from the Gemini Files API, which would otherwise keep it for 48 hours."""
+    try:
+        genai.delete_file(uploaded_file.name)
+    except Exception as e:
+        logging.warning(f"Could not delete uploaded file {uploaded_file.name}: {e}")
+
+
+def _iter_response_text(response):
+    """
+    Yield the text of each chunk of a streamed Gemini response.
+    
+    Chunks without content parts (such as a final chunk carrying only the
+    finish reason) are skipped, since reading their text raises.
+    """
+    for chunk in response:
+        if chunk.parts:
+            yield chunk.text
+
+
+def _write_text(f, text):
+    """Write a string, or an iterable of string chunks as they arrive, to an open file."""
+    if isinstance(text, str):
+        f.write(text)
+    else:
+        for chunk in text:
+            f.write(chunk)
+
+
+def _get_uploaded_transcript(transcript_path):
+    """
+    Return an uploaded copy of a transcript file, uploading it only if needed.
+    
+    Uploads are cached by path and reused until the file's modification time
+    or size changes, so repeated questions about a transcript don't resend it.
+    
+    Args:
+        transcript_path (str): Path to the transcript file
+        
+    Returns:
+        genai.types.File: The uploaded transcript
+        
+    Raises:
+        FileNotFoundError: If the transcript file does not exist
+        APIError: If Gemini could not process the uploaded file
+    """
+    try:
+        stat_result = os.stat(transcript_path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Transcript file {transcript_path} does not exist.")
+    version = (stat_result.st_mtime_ns, stat_result.st_size)
+    stale_files = []
+    with _uploaded_transcripts_lock:
+        cached = _uploaded_transcripts.get(transcript_path)
+        if cached is not None and cached[0] == version:
+            _uploaded_transcripts.move_to_end(transcript_path)
+            return cached[1]
+
+        uploaded_file = _upload_file(transcript_path, 'text/plain')
+        if cached is not None:
+            stale_files.append(cached[1])
+        _uploaded_transcripts[transcript_path] = (version, uploaded_file)
+        _uploaded_transcripts.move_to_end(transcript_path)
+        while len(_uploaded_transcripts) > TRANSCRIPT_UPLOAD_CACHE_SIZE:
+            stale_files.append(_uploaded_transcripts.popitem(last=False)[1][1])
+
+    for stale_file in stale_files:
+        _delete_uploaded_file(stale_file)
+    return uploaded_file
+
+
+def _prefetch_transcript_upload(transcript_path):
+    """Upload a transcript ahead of use. Errors are left for the actual request to report."""
+    try:
+        _get_uploaded_transcript(transcript_path)
+    except Exception as e:
+        logging.debug(f"Prefetching transcript upload failed: {e}")
+
+
+@atexit.register
+def _delete_uploaded_transcripts():
+    """Delete the cached transcript uploads when the program exits."""
+    with _uploaded_transcripts_lock:
+        while _uploaded_transcripts:
+            _delete_uploaded_file(_uploaded_transcripts.popitem()[1][1])
 
 
 def _check_available_memory():
@@ -107,7 +375,11 @@ def _check_available_memory():
 
 def _transcribe_audio_gemini(audio_file_path, model_name=GEMINI_MODEL_FLASH):
     """
-    Transcribe audio using Gemini with memory-efficient file handling.
+    Transcribe audio using Gemini, streaming the file to the Gemini Files API.
+    
+    The file is uploaded from disk in chunks and referenced by handle in the request,
+    so it is never read into memory or base64-encoded, whatever its size. Long audio
+    is split into segments that are transcribed in parallel.
     
     Args:
         audio_file_path (str): Path to the audio file to transcribe
@@ -117,159 +389,249 @@ def _transcribe_audio_gemini(audio_file_path, model_name=GEMINI_MODEL_FLASH):
         str: The transcribed text
         
     Raises:
-        APIError: If no response is received from Gemini API
+        APIError: If the upload fails or no response is received from Gemini API
     """
-    file_size_mb = os.path.getsize(audio_file_path) / (1024 * 1024)
-    
-    # Check if the file is larger than 20MB
-    if file_size_mb > 20:
-        return _transcribe_large_audio_gemini(audio_file_path, model_name)
+    return asyncio.run(_transcribe_audio_gemini_async(audio_file_path, model_name))
+
 
-    # Check available memory before loading file
-    available_memory = _check_available_memory()
-    estimated_memory_needed = file_size_mb * 3  # Base64 encoding roughly triples size
+async def _transcribe_audio_gemini_async(audio_file_path, model_name=GEMINI_MODEL_FLASH,
+                                         semaphore=None):
+    """
+    Transcribe audio using Gemini from an event loop.
+    
+    Audio longer than TRANSCRIPTION_SEGMENT_SECONDS is split with ffmpeg (when
+    available) and the segments are transcribed concurrently, then joined in order.
+    Besides being faster, this keeps each transcript within the model's output limit.
     
-    if estimated_memory_needed > available_memory * 0.8:  # Use max 80% of available memory
-        logging.warning(f"File size ({file_size_mb:.1f}MB) may cause memory issues. Available: {available_memory:.1f}MB")
-        print(f"\nWarning: Large file may cause memory issues. Consider using a smaller file.")
+    Args:
+        audio_file_path (str): Path to the audio file to transcribe
+        model_name (str, optional): Name of the Gemini model to use. Defaults to GEMINI_MODEL_FLASH.
+        semaphore (asyncio.Semaphore, optional): Limits concurrent requests when shared
+            across several calls. Defaults to a new MAX_CONCURRENT_TRANSCRIPTIONS semaphore.
+        
+    Returns:
+        str: The transcribed text
         
-        # Ask user if they want to proceed
-        proceed = input("Do you want to proceed anyway? (y/n): ").lower()
-        if proceed != 'y':
-            raise APIError("Transcription cancelled due to memory concerns.")
+    Raises:
+        APIError: If the upload fails or no response is received from Gemini API
+    """
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_TRANSCRIPTIONS)
+    model = _get_model(model_name)
+
+    with tempfile.TemporaryDirectory(prefix="gemini_segments_") as segment_dir:
+        segment_paths = await asyncio.to_thread(_split_audio, audio_file_path, segment_dir)
+        if len(segment_paths) > 1:
+            print(f"Transcribing {len(segment_paths)} segments of {TRANSCRIPTION_SEGMENT_SECONDS // 60} minutes in parallel...")
+        else:
+            print("Uploading audio file to Gemini...")
+            segment_paths = [audio_file_path]
 
-    try:
-        model = genai.GenerativeModel(model_name)
-        mime_type = _get_mime_type(audio_file_path)
+        # Let every segment finish, and delete its upload, before the segment files are removed
+        transcripts = await asyncio.gather(*(
+            _transcribe_segment_async(model, segment_path, semaphore)
+            for segment_path in segment_paths
+        ), return_exceptions=True)
+    for transcript in transcripts:
+        if isinstance(transcript, BaseException):
+            raise transcript
+    return "\n\n".join(transcripts)
+
+
+async def _transcribe_segment_async(model, audio_file_path, semaphore):
+    """
+    Upload one audio file, transcribe it and delete the upload.
+    
+    Requests that fail with a rate-limit or transient server error are retried
+    with exponential backoff, up to API_RETRY_ATTEMPTS attempts in total.
+    
+    Returns:
+        str: The transcribed text
         
-        # Read file with memory monitoring
-        print(f"Loading audio file ({file_size_mb:.1f}MB)...")
-        with open(audio_file_path, 'rb') as f:
-            audio_bytes = f.read()
-            
-        # Monitor memory usage during base64 encoding
-        print("Encoding audio data...")
-        audio_base64 = base64.b64encode(audio_bytes).decode('utf-8')
-        
-        # Clear the original bytes to free memory
-        del audio_bytes
-        
-        # Use the updated API format
-        response = model.generate_content(
-            [
-                {"text": "Generate a complete and accurate transcript."},
-                {
-                    "inline_data": {
-                        "mime_type": mime_type,
-                        "data": audio_base64
-                    }
-                }
-            ]
-        )
-        
-        # Clear base64 data to free memory
-        del audio_base64
-        
-        # Check for empty response and provide detailed error
-        if not response:
-            raise APIError("Empty response received from Gemini API")
-        if not response.text:
-            error_details = getattr(response, 'error', 'Unknown error')
-            raise APIError(f"No text in Gemini API response. Details: {error_details}")
-            
-        return response.text
+    Raises:
+        APIError: If the upload fails or no response is received from Gemini API
+    """
+    uploaded_file = None
+    try:
+        async with semaphore:
+            uploaded_file = await asyncio.to_thread(_upload_file, audio_file_path,
+                                                    _get_mime_type(audio_file_path))
+            for attempt in itertools.count():
+                await _request_rate_limiter.acquire_async()
+                try:
+                    # The SDK's async client is bound to the first event loop it runs on, and every
+                    # transcription uses a fresh asyncio.run(), so use the blocking call in a thread
+                    response = await asyncio.to_thread(model.generate_content,
+                                                       [TRANSCRIPTION_PROMPT, uploaded_file])
+                    break
+                except Exception as e:
+                    delay = _retry_delay(attempt, e)
+                    if delay is None:
+                        raise
+                    await asyncio.sleep(delay)
+        return _transcript_text(response)
         
-    except MemoryError:
-        raise APIError(f"Memory error processing audio file ({file_size_mb:.1f}MB). File too large for available system memory.")
     except Exception as e:
         # Propagate original exception details
         if not isinstance(e, APIError):
             raise APIError(f"Gemini API transcription error: {str(e)}")
         raise
+    finally:
+        if uploaded_file is not None:
+            await asyncio.to_thread(_delete_uploaded_file, uploaded_file)
 
 
-def _transcribe_large_audio_gemini(audio_file_path, model_name=GEMINI_MODEL_FLASH, max_file_size_mb=100):
+def _retry_delay(attempt, error):
     """
-    Transcribe large audio files with proper memory management and file size limits.
+    Return how long to wait before retrying a failed Gemini request, or None to give up.
+    
+    Only rate-limit, timeout and transient server errors are retried, with an
+    exponentially growing, jittered delay, up to API_RETRY_ATTEMPTS attempts in total.
     
     Args:
-        audio_file_path (str): Path to the large audio file to transcribe
-        model_name (str, optional): Name of the Gemini model to use. Defaults to GEMINI_MODEL_FLASH.
-        max_file_size_mb (int, optional): Maximum file size to process in MB. Defaults to 100.
+        attempt (int): Zero-based number of the attempt that failed
+        error (Exception): The error it failed with
         
     Returns:
-        str: The transcribed text
+        float: Seconds to wait, or None if the error should be raised
+    """
+    if attempt + 1 >= API_RETRY_ATTEMPTS or not _RETRYABLE_ERROR_PATTERN.search(str(error)):
+        return None
+    delay = min(API_RETRY_MAX_DELAY, API_RETRY_BASE_DELAY * 2 ** attempt) + random.random() * API_RETRY_JITTER
+    logging.warning(f"Gemini request failed ({error}), retrying in {delay:.1f}s")
+    return delay
+
+
+def _call_with_retry(fn, *args, **kwargs):
+    """
+    Call a blocking Gemini API function, retrying transient failures with backoff.
+    
+    Every attempt first takes a token from the shared request rate limiter.
+    
+    Args:
+        fn (callable): The API function to call, e.g. model.generate_content
+        *args, **kwargs: Arguments passed to fn
         
-    Raises:
-        APIError: If no response is received from Gemini API or file is too large
+    Returns:
+        The return value of fn
     """
+    for attempt in itertools.count():
+        _request_rate_limiter.acquire()
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            delay = _retry_delay(attempt, e)
+            if delay is None:
+                raise
+            time.sleep(delay)
+
+
+def _split_audio(audio_file_path, output_dir):
+    """
+    Split audio into TRANSCRIPTION_SEGMENT_SECONDS segments with ffmpeg, without re-encoding.
+    
+    Args:
+        audio_file_path (str): Path to the audio file to split
+        output_dir (str): Directory to write the segments to
+        
+    Returns:
+        list: Paths of the segments in playback order. Empty if the audio fits in one
+            segment, or ffmpeg is not installed or failed, in which case the file
+            should be sent whole.
+    """
+    if FFMPEG_PATH is None:
+        return []
+
+    # Splitting remuxes the whole file, so skip it when the audio fits in one segment
+    duration = _probe_duration(audio_file_path)
+    if duration is not None and duration <= TRANSCRIPTION_SEGMENT_SECONDS:
+        return []
+
+    ext = os.path.splitext(audio_file_path)[1].lower()
+    command = [
+        FFMPEG_PATH, '-v', 'error', '-i', audio_file_path,
+        '-map', '0:a', '-c', 'copy',  # Audio streams only, copied as-is
+        '-f', 'segment', '-segment_time', str(TRANSCRIPTION_SEGMENT_SECONDS), '-reset_timestamps', '1',
+        os.path.join(output_dir, f"segment_%04d{ext}"),
+    ]
     try:
-        file_size_mb = os.path.getsize(audio_file_path) / (1024 * 1024)
+        subprocess.run(command, check=True, capture_output=True)
+    except (OSError, subprocess.CalledProcessError) as e:
+        logging.warning(f"Could not split {audio_file_path} with ffmpeg, sending it whole: {e}")
+        return []
+    # Zero-padded names sort in playback order
+    return sorted(os.path.join(output_dir, name) for name in os.listdir(output_dir))
+
+
+def _probe_duration(audio_file_path):
+    """
+    Return the duration of an audio file in seconds using ffprobe.
+    
+    Args:
+        audio_file_path (str): Path to the audio file
         
-        # Check file size limits
-        if file_size_mb > max_file_size_mb:
-            raise APIError(f"File too large ({file_size_mb:.1f}MB). Maximum supported size is {max_file_size_mb}MB. "
-                          f"Please split the file into smaller segments.")
+    Returns:
+        float: The duration in seconds, or None if ffprobe is not installed or
+            could not determine it
+    """
+    if FFPROBE_PATH is None:
+        return None
+
+    command = [
+        FFPROBE_PATH, '-v', 'error', '-show_entries', 'format=duration',
+        '-of', 'default=noprint_wrappers=1:nokey=1', audio_file_path,
+    ]
+    try:
+        result = subprocess.run(command, check=True, capture_output=True, text=True)
+        return float(result.stdout.strip())
+    except (OSError, subprocess.CalledProcessError, ValueError) as e:
+        logging.warning(f"Could not determine the duration of {audio_file_path} with ffprobe: {e}")
+        return None
+
+
+def _transcript_text(response):
+    """
+    Return the text of a transcription response.
+    
+    Raises:
+        APIError: If the response is empty or has no text
+    """
+    # Check for empty response and provide detailed error
+    if not response:
+        raise APIError("Empty response received from Gemini API")
+    if not response.text:
+        error_details = getattr(response, 'error', 'Unknown error')
+        raise APIError(f"No text in Gemini API response. Details: {error_details}")
+    return response.text
+
+
+def _validate_audio_file(audio_file_path):
+    """
+    Check that an audio file exists and has a format Gemini supports.
+    
+    Returns:
+        int: The file size in bytes, from the same stat call that checked existence
         
-        # Check available memory
-        available_memory = _check_available_memory()
-        estimated_memory_needed = file_size_mb * 3  # Base64 encoding roughly triples size
-        
-        if estimated_memory_needed > available_memory * 0.6:  # Use max 60% for large files
-            raise APIError(f"Insufficient memory to process file ({file_size_mb:.1f}MB). "
-                          f"Estimated memory needed: {estimated_memory_needed:.1f}MB, "
-                          f"Available: {available_memory:.1f}MB. "
-                          f"Please close other applications or use a smaller file.")
-        
-        client = genai.GenerativeModel(model_name)
-        mime_type = _get_mime_type(audio_file_path)
-        
-        # For very large files (>50MB), warn the user
-        if file_size_mb > 50:
-            logging.warning(f"Very large audio file: {file_size_mb:.1f}MB. Transcription may take a long time.")
-            print(f"\nWarning: This is a very large audio file ({file_size_mb:.1f}MB). Transcription may take a long time.")
-            print(f"Available memory: {available_memory:.1f}MB")
-            print(f"Estimated memory needed: {estimated_memory_needed:.1f}MB")
-        
-        # Read file with progress indication for large files
-        print(f"Loading large audio file ({file_size_mb:.1f}MB)...")
-        with open(audio_file_path, 'rb') as f:
-            audio_bytes = f.read()
-        
-        print("Encoding large audio file...")
-        audio_base64 = base64.b64encode(audio_bytes).decode('utf-8')
-        
-        # Clear original bytes to free memory
-        del audio_bytes
-        
-        print("Sending to Gemini API...")
-        # Process the audio data
-        response = client.generate_content(
-            [
-                "Generate a complete and accurate transcript.",
-                {"inline_data": {"mime_type": mime_type, "data": audio_base64}}
-            ]
-        )
-        
-        # Clear base64 data to free memory
-        del audio_base64
-        
-        # Check for empty response with detailed error info
-        if not response:
-            raise APIError("Empty response received from Gemini API for large audio file")
-        if not response.text:
-            error_details = getattr(response, 'error', 'Unknown error')
-            raise APIError(f"No text in Gemini API response for large audio. Details: {error_details}")
-            
-        return response.text
+    Raises:
+        FileNotFoundError: If the audio file does not exist
+        ValueError: If the file extension is not a supported audio format
+    """
+    # Check if file exists
+    try:
+        file_size = os.stat(audio_file_path).st_size
+    except FileNotFoundError:
+        error_msg = f"File {audio_file_path} does not exist."
+        logging.error(error_msg)
+        raise FileNotFoundError(error_msg)
         
-    except MemoryError:
-        raise APIError(f"Memory error processing large audio file ({file_size_mb:.1f}MB). File too large for available system memory.")
-    except Exception as e:
-        # Propagate original exception details
-        if not isinstance(e, APIError):
-            raise APIError(f"Gemini API large file transcription error: {str(e)}")
-        raise
+    # Validate file is actually an audio file
+    file_ext = os.path.splitext(audio_file_path)[1].lower()
+    if file_ext not in AUDIO_MIME_TYPES:
+        error_msg = f"File {audio_file_path} does not appear to be a supported audio format."
+        logging.error(error_msg)
+        raise ValueError(error_msg)
+    
+    return file_size
 
 
 def transcribe_audio_with_gemini(audio_file_path):
@@ -293,22 +655,8 @@ def transcribe_audio_with_gemini(audio_file_path):
         print("\nTranscribing audio using Google's Gemini API...")
         print("This may take a while depending on the file size.")
 
-        # Check if file exists
-        if not os.path.exists(audio_file_path):
-            error_msg = f"File {audio_file_path} does not exist."
-            logging.error(error_msg)
-            raise FileNotFoundError(error_msg)
-            
-        # Validate file is actually an audio file
-        file_ext = os.path.splitext(audio_file_path)[1].lower()
-        valid_audio_exts = ['.mp3', '.wav', '.m4a', '.aac', '.ogg', '.flac', '.aiff']
-        if file_ext not in valid_audio_exts:
-            error_msg = f"File {audio_file_path} does not appear to be a supported audio format."
-            logging.error(error_msg)
-            raise ValueError(error_msg)
-
         # Check file size and provide user feedback
-        file_size_mb = os.path.getsize(audio_file_path) / (1024 * 1024)
+        file_size_mb = _validate_audio_file(audio_file_path) / (1024 * 1024)
         print(f"Audio file size: {file_size_mb:.1f}MB")
         
         # Check available memory
@@ -322,14 +670,8 @@ def transcribe_audio_with_gemini(audio_file_path):
             logging.error(error_msg)
             raise APIError(error_msg)
             
-        # Save transcript
-        transcript_path = _save_transcript(audio_file_path, transcript_text, "gemini")
-        if not transcript_path or not os.path.exists(transcript_path):
-            error_msg = "Failed to save transcript file"
-            logging.error(error_msg)
-            raise FilesystemError(error_msg)
-            
-        return transcript_path
+        # Save transcript; _save_transcript raises FilesystemError rather than returning a bad path
+        return _save_transcript(audio_file_path, transcript_text, "gemini")
 
     except (FileNotFoundError, ValueError, APIError, FilesystemError) as e:
         # Handle specific exceptions with appropriate error messages
@@ -345,13 +687,60 @@ def transcribe_audio_with_gemini(audio_file_path):
         raise APIError(error_msg)
 
 
+def transcribe_audio_files_with_gemini(audio_file_paths):
+    """
+    Transcribe several audio files concurrently with Google's Gemini API.
+    
+    Up to MAX_CONCURRENT_TRANSCRIPTIONS files or segments are uploaded and
+    transcribed at a time, so the batch takes roughly as long as its slowest
+    files rather than the sum of all of them. A failure is reported and does not stop the others.
+    
+    Args:
+        audio_file_paths (list): Paths of the audio files to transcribe
+        
+    Returns:
+        list: The saved transcript path for each input file, in the same order,
+            or None for files that failed
+            
+    Raises:
+        ImportError: If the Gemini API library is not installed
+        APIError: If no valid API key is provided
+    """
+    _check_gemini_availability()
+    print(f"\nTranscribing {len(audio_file_paths)} audio files using Google's Gemini API...")
+
+    async def _transcribe_all():
+        # Shared by every file so the limit holds for the batch as a whole
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_TRANSCRIPTIONS)
+
+        async def _transcribe_one(audio_file_path):
+            _validate_audio_file(audio_file_path)
+            transcript_text = await _transcribe_audio_gemini_async(audio_file_path, GEMINI_MODEL_FLASH,
+                                                                   semaphore)
+            return await asyncio.to_thread(_save_transcript, audio_file_path, transcript_text, "gemini")
+
+        return await asyncio.gather(*(_transcribe_one(path) for path in audio_file_paths),
+                                    return_exceptions=True)
+
+    transcript_paths = []
+    for audio_file_path, result in zip(audio_file_paths, asyncio.run(_transcribe_all())):
+        if isinstance(result, Exception):
+            logging.error(f"Transcription of {audio_file_path} failed: {result}")
+            handle_gemini_error(result)
+            transcript_paths.append(None)
+        else:
+            transcript_paths.append(result)
+    return transcript_paths
+
+
 def _save_transcript(audio_file_path, transcript_text, service="gemini"):
     """
-    Save transcript to a file with proper file locking to prevent race conditions.
+    Save transcript to a file atomically, so readers never see a partially written transcript.
     
     Args:
         audio_file_path (str): Path to the original audio file
-        transcript_text (str): The transcribed text content to save
+        transcript_text (str or iterable): The transcribed text, either as a string or
+            as an iterable of text chunks (e.g. a streamed response) written as they arrive
         service (str, optional): Service name to include in the output filename. Defaults to "gemini".
         
     Returns:
@@ -360,59 +749,24 @@ def _save_transcript(audio_file_path, transcript_text, service="gemini"):
     Raises:
         FilesystemError: If there's an error saving the transcript to a file
     """
-    import tempfile  # For safe atomic writes
-    
-    transcript_path = None
-    temp_file = None
+    temp_path = None
     
     try:
-        # Generate transcript filename
-        audio_path = Path(audio_file_path)
-        transcript_filename = f"{audio_path.stem}_{service}_transcript.txt"
-        transcript_path = audio_path.parent / transcript_filename
-        
-        # Create a temporary file in the same directory for atomic writes
-        temp_dir = audio_path.parent
-        temp_file = tempfile.NamedTemporaryFile(mode='w', 
-                                              dir=temp_dir, 
-                                              suffix='.txt', 
-                                              encoding='utf-8',
-                                              delete=False)
-        
-        # Use cross-platform file locking if available
-        try:
-            # Write to temporary file
-            with open(temp_file.name, 'w', encoding='utf-8') as f:
-                if FILE_LOCKING_AVAILABLE:
-                    # Acquire exclusive lock using portalocker (cross-platform)
-                    try:
-                        portalocker.lock(f, portalocker.LOCK_EX)
-                        # Write content
-                        f.write(transcript_text)
-                        # Release lock (happens automatically when file is closed)
-                    except Exception as lock_error:
-                        # If locking fails, continue without locking but log warning
-                        logging.warning(f"File locking failed, continuing without lock: {lock_error}")
-                        f.write(transcript_text)
-                else:
-                    # No locking available, write directly
-                    logging.info("File locking not available, writing without lock")
-                    f.write(transcript_text)
-            
-            # Atomic rename to target file (this is thread-safe)
-            os.replace(temp_file.name, transcript_path)
-            
-        except Exception as e:
-            # Clean up temp file in case of error
-            if temp_file and os.path.exists(temp_file.name):
-                try:
-                    os.unlink(temp_file.name)
-                except:
-                    pass
-            raise e
+        # Generate transcript filename next to the audio file
+        audio_dir, audio_filename = os.path.split(audio_file_path)
+        transcript_filename = f"{os.path.splitext(audio_filename)[0]}_{service}_transcript.txt"
+        transcript_path = os.path.join(audio_dir, transcript_filename)
+        
+        # Write to a uniquely named temporary file in the same directory, then rename it
+        # into place; the rename is atomic, so no locking is needed
+        fd, temp_path = tempfile.mkstemp(dir=audio_dir or os.curdir, suffix='.txt')
+        with os.fdopen(fd, 'w', encoding='utf-8', buffering=OUTPUT_BUFFER_SIZE) as f:
+            _write_text(f, transcript_text)
+        os.replace(temp_path, transcript_path)
+        temp_path = None
             
         print(f"\nTranscript saved to: {transcript_path}")
-        return str(transcript_path)
+        return transcript_path
         
     except (IOError, OSError) as e:
         error_msg = f"Error saving transcript: {str(e)}"
@@ -423,14 +777,15 @@ def _save_transcript(audio_file_path, transcript_text, service="gemini"):
         logging.error(error_msg)
         raise FilesystemError(error_msg)
     finally:
-        # Clean up temporary file if it exists and wasn't renamed
-        if temp_file and os.path.exists(temp_file.name):
+        # Clean up the temporary file if it wasn't renamed
+        if temp_path is not None:
             try:
-                os.unlink(temp_file.name)
-            except:
+                os.unlink(temp_path)
+            except OSError:
                 pass
 
 
+@functools.lru_cache(maxsize=128)
 def _get_mime_type(file_path):
     """
     Determine MIME type based on file extension.
@@ -441,18 +796,122 @@ def _get_mime_type(file_path):
     Returns:
         str: MIME type corresponding to the file extension, defaults to 'audio/mpeg' if unknown
     """
-    # Simple dictionary-based approach for common audio formats
-    mime_types = {
-        '.mp3': 'audio/mpeg',
-        '.wav': 'audio/wav',
-        '.m4a': 'audio/mp4',
-        '.aac': 'audio/aac',
-        '.ogg': 'audio/ogg',
-        '.flac': 'audio/flac',
-        '.aiff': 'audio/aiff',
-    }
     ext = os.path.splitext(file_path)[1].lower()
-    return mime_types.get(ext, 'audio/mpeg')  # Default to audio/mpeg
+    return AUDIO_MIME_TYPES.get(ext, 'audio/mpeg')  # Default to audio/mpeg
+
+
+# Troubleshooting tips keyed by a lower-case phrase to look for in the error message.
+# When several phrases occur, the one listed first wins; "generic" is the fallback.
+GEMINI_ERROR_TIPS = {
+    # API key related errors
+    "api key not valid": [
+        "Check that you've entered your Gemini API key correctly.",
+        "Verify your API key is still valid.",
+        "Create a new API key if needed."
+    ],
+    "invalid": [
+        "The API key format appears to be incorrect.",
+        "Ensure you're using a valid Gemini API key (typically starts with 'AI').",
+        "Get a new API key from Google AI Studio if needed."
+    ],
+    "unauthorized": [
+        "Your API key doesn't have permission for this operation.",
+        "Check that your API key has the necessary permissions.",
+        "Verify that you're using the correct API key for this service."
+    ],
+    
+    # Rate limiting and quota errors
+    "quota": [
+        "You've reached your API usage limit.",
+        "Wait and try again later or check your API usage limits.",
+        "Consider upgrading your API tier if you need higher usage limits."
+    ],
+    "rate limit": [
+        "Too many requests in a short period of time.",
+        "Implement exponential backoff in your requests.",
+        "Wait a few minutes before trying again."
+    ],
+    
+    # Content and file-related errors
+    "file size": [
+        "The audio file is too large for Gemini API.",
+        "Try with a smaller audio file or split the file.",
+        "The Gemini Files API accepts files up to 2GB each."
+    ],
+    "content": [
+        "The content may violate Google's acceptable use policies.",
+        "Check that your content adheres to Gemini's content policies.",
+        "Try using different content."
+    ],
+    "format": [
+        "The audio format is not supported.",
+        "Try converting to a supported format like MP3, WAV, or FLAC.",
+        "Check the file extension matches the actual file format."
+    ],
+    "empty": [
+        "The audio file appears to be empty or corrupted.",
+        "Check that the audio file contains valid audio data.",
+        "Try a different audio file."
+    ],
+    
+    # Connection and service errors
+    "connection": [
+        "Could not connect to the Gemini API.",
+        "Check your internet connection.",
+        "The service might be temporarily unavailable - try again later."
+    ],
+    "timeout": [
+        "The request timed out.",
+        "Try again later or with a smaller file.",
+        "Check your network connection speed."
+    ],
+    "server": [
+        "A server error occurred on Google's end.",
+        "This is not an issue with your code or files.",
+        "Try again later when the service might be more stable."
+    ],
+    
+    # File system errors
+    "file not found": [
+        "The audio file could not be found.",
+        "Check that the file path is correct and the file exists.",
+        "Verify file permissions allow reading the file."
+    ],
+    "permission": [
+        "Permission denied when trying to access the file.",
+        "Check that you have the necessary permissions to read/write the files.",
+        "Try running the script with appropriate permissions."
+    ],
+    
+    # Memory errors
+    "memory": [
+        "Not enough memory to process the file.",
+        "Try with a smaller file or on a system with more memory.",
+        "Close other applications to free up memory."
+    ],
+    
+    # Generic errors (default fallback)
+    "generic": [
+        "Check your internet connection.",
+        "Verify that the Google Gemini API is available.",
+        "Try again later or with a different audio file.",
+        "Update to the latest version of the google-generativeai library."
+    ]
+}
+
+# One alternation over all phrases, so the message is scanned once however many there are
+_ERROR_TIP_PATTERN = re.compile("|".join(re.escape(key) for key in GEMINI_ERROR_TIPS if key != "generic"),
+                                re.IGNORECASE)
+_ERROR_TIP_PRIORITY = {key: index for index, key in enumerate(GEMINI_ERROR_TIPS)}
+
+# Tips to fall back on by exception type when no phrase matches the message
+_ERROR_TYPE_TIPS = (
+    (FileNotFoundError, "file not found"),
+    (PermissionError, "permission"),
+    (MemoryError, "memory"),
+    (TimeoutError, "timeout"),
+    (ConnectionError, "connection"),
+)
 
 
 def handle_gemini_error(error):
@@ -470,141 +929,17 @@ def handle_gemini_error(error):
     logging.error(f"Gemini API Error ({error_type}): {error_message}")
     print(f"\nGemini API Error ({error_type}):", error_message)
 
-    # Comprehensive error tip dictionary covering various error cases
-    error_tips = {
-        # API key related errors
-        "API key not valid": [
-            "Check that you've entered your Gemini API key correctly.",
-            "Verify your API key is still valid.",
-            "Create a new API key if needed."
-        ],
-        "invalid": [
-            "The API key format appears to be incorrect.",
-            "Ensure you're using a valid Gemini API key (typically starts with 'AI').",
-            "Get a new API key from Google AI Studio if needed."
-        ],
-        "unauthorized": [
-            "Your API key doesn't have permission for this operation.",
-            "Check that your API key has the necessary permissions.",
-            "Verify that you're using the correct API key for this service."
-        ],
-        
-        # Rate limiting and quota errors
-        "quota": [
-            "You've reached your API usage limit.",
-            "Wait and try again later or check your API usage limits.",
-            "Consider upgrading your API tier if you need higher usage limits."
-        ],
-        "rate limit": [
-            "Too many requests in a short period of time.",
-            "Implement exponential backoff in your requests.",
-            "Wait a few minutes before trying again."
-        ],
-        
-        # Content and file-related errors
-        "file size": [
-            "The audio file is too large for Gemini API.",
-            "Try with a smaller audio file or split the file.",
-            "The current limit is 20MB per request."
-        ],
-        "content": [
-            "The content may violate Google's acceptable use policies.",
-            "Check that your content adheres to Gemini's content policies.",
-            "Try using different content."
-        ],
-        "format": [
-            "The audio format is not supported.",
-            "Try converting to a supported format like MP3, WAV, or FLAC.",
-            "Check the file extension matches the actual file format."
-        ],
-        "empty": [
-            "The audio file appears to be empty or corrupted.",
-            "Check that the audio file contains valid audio data.",
-            "Try a different audio file."
-        ],
-        
-        # Connection and service errors
-        "connection": [
-            "Could not connect to the Gemini API.",
-            "Check your internet connection.",
-            "The service might be temporarily unavailable - try again later."
-        ],
-        "timeout": [
-            "The request timed out.",
-            "Try again later or with a smaller file.",
-            "Check your network connection speed."
-        ],
-        "server": [
-            "A server error occurred on Google's end.",
-            "This is not an issue with your code or files.",
-            "Try again later when the service might be more stable."
-        ],
-        
-        # File system errors
-        "file not found": [
-            "The audio file could not be found.",
-            "Check that the file path is correct and the file exists.",
-            "Verify file permissions allow reading the file."
-        ],
-        "permission": [
-            "Permission denied when trying to access the file.",
-            "Check that you have the necessary permissions to read/write the files.",
-            "Try running the script with appropriate permissions."
-        ],
-        
-        # Memory errors
-        "memory": [
-            "Not enough memory to process the file.",
-            "Try with a smaller file or on a system with more memory.",
-            "Close other applications to free up memory."
-        ],
-        
-        # Generic errors (default fallback)
-        "generic": [
-            "Check your internet connection.",
-            "Verify that the Google Gemini API is available.",
-            "Try again later or with a different audio file.",
-            "Update to the latest version of the google-generativeai library."
-        ]
-    }
-
-    # Try to match the error message with appropriate tips
-    matched = False
-    for key, tips in error_tips.items():
-        if key.lower() in error_message.lower():
-            print("\nTroubleshooting tips:")
-            for tip in tips:
-                print(f"- {tip}")
-            matched = True
-            break
-    
-    # If no specific error matched, use error type to find more relevant tips
-    if not matched:
-        if isinstance(error, FileNotFoundError) and "file not found" in error_tips:
-            print("\nTroubleshooting tips:")
-            for tip in error_tips["file not found"]:
-                print(f"- {tip}")
-        elif isinstance(error, PermissionError) and "permission" in error_tips:
-            print("\nTroubleshooting tips:")
-            for tip in error_tips["permission"]:
-                print(f"- {tip}")
-        elif isinstance(error, MemoryError) and "memory" in error_tips:
-            print("\nTroubleshooting tips:")
-            for tip in error_tips["memory"]:
-                print(f"- {tip}")
-        elif isinstance(error, TimeoutError) and "timeout" in error_tips:
-            print("\nTroubleshooting tips:")
-            for tip in error_tips["timeout"]:
-                print(f"- {tip}")
-        elif isinstance(error, ConnectionError) and "connection" in error_tips:
-            print("\nTroubleshooting tips:")
-            for tip in error_tips["connection"]:
-                print(f"- {tip}")
-        else:
-            # If still no match, use generic tips
-            print("\nTroubleshooting tips:")
-            for tip in error_tips["generic"]:
-                print(f"- {tip}")
+    # Pick the highest-priority phrase found in the message, else fall back on the error type
+    matched_keys = {match.group(0).lower() for match in _ERROR_TIP_PATTERN.finditer(error_message)}
+    if matched_keys:
+        tip_key = min(matched_keys, key=_ERROR_TIP_PRIORITY.__getitem__)
+    else:
+        tip_key = next((key for error_class, key in _ERROR_TYPE_TIPS if isinstance(error, error_class)),
+                       "generic")
+
+    print("\nTroubleshooting tips:")
+    for tip in GEMINI_ERROR_TIPS[tip_key]:
+        print(f"- {tip}")
 
     print("\nFor technical support, please provide the following error details:")
     print(f"Error type: {error_type}")
@@ -615,6 +950,10 @@ def chat_with_content(content_path, content_type="transcript"):
     """
     Start an interactive chat session with content using Gemini.
     
+    The content is uploaded once through the Files API. Where the model supports it,
+    the content is also put in a context cache, so later turns don't pay to process
+    it again; otherwise it is referenced from the chat history as a file.
+    
     Args:
         content_path (str): Path to the content file (transcript or audio)
         content_type (str, optional): Type of content ('transcript' or 'audio'). Defaults to "transcript".
@@ -625,6 +964,8 @@ def chat_with_content(content_path, content_type="transcript"):
         APIError: If no response is received from Gemini API
     """
 
+    uploaded_file = None
+    cached_content = None
     try:
         _check_gemini_availability()
         if not os.path.exists(content_path):
@@ -634,15 +975,34 @@ def chat_with_content(content_path, content_type="transcript"):
             raise ValueError(f"Unsupported content type: {content_type}")
 
         model_name = GEMINI_MODEL_PRO if content_type == "transcript" else GEMINI_MODEL_FLASH
-        model = genai.GenerativeModel(model_name)
-        chat = model.start_chat()  # Initialize chat session
-
-        _print_chat_instructions(content_type)
+        system_instruction = CHAT_SYSTEM_INSTRUCTION.format(content_type=content_type)
 
+        print(f"\nUploading {content_type} to Gemini...")
         if content_type == "transcript":
-            with open(content_path, 'r', encoding='utf-8') as f:
-                transcript_text = f.read()
-            chat.send_message(f"You are an AI assistant for a transcript. Use this transcript to answer: {transcript_text}")
+            # Shared with the other transcript features and cleaned up at exit
+            content_file = _get_uploaded_transcript(content_path)
+        else:
+            content_file = uploaded_file = _upload_file(content_path, _get_mime_type(content_path))
+
+        try:
+            cached_content = genai.caching.CachedContent.create(
+                model=model_name, system_instruction=system_instruction,
+                contents=[content_file], ttl=CHAT_CACHE_TTL)
+        except Exception as e:
+            # Caching needs a minimum amount of content and a model that supports it
+            logging.debug(f"Context caching not used for this chat: {e}")
+
+        if cached_content is not None:
+            chat = genai.GenerativeModel.from_cached_content(cached_content).start_chat()
+        else:
+            # Prime the chat with the content instead of spending a request on it
+            model = _get_model(model_name, system_instruction)
+            chat = model.start_chat(history=[
+                {"role": "user", "parts": [content_file, f"This is the {content_type} to discuss."]},
+                {"role": "model", "parts": [f"I have the {content_type} and will answer questions based on it."]},
+            ])
+
+        _print_chat_instructions(content_type, cached=cached_content is not None)
 
         while True:
             user_input = input("\nYou: ")
@@ -651,18 +1011,37 @@ def chat_with_content(content_path, content_type="transcript"):
                 break
 
             print("\nAI is thinking...")
-            response = chat.send_message(user_input)
-            if not response or not response.text:
-                raise APIError("No response from Gemini API.")
+            response = _call_with_retry(chat.send_message, user_input, stream=True)
             print("\nAI:")
-            print(response.text)
+            # Show the answer as it is generated rather than after it is complete
+            received_text = False
+            for chunk_text in _iter_response_text(response):
+                sys.stdout.write(chunk_text)
+                sys.stdout.flush()
+                received_text = received_text or bool(chunk_text)
+            if not received_text:
+                raise APIError("No response from Gemini API.")
+            sys.stdout.write("\n")
 
     except Exception as e:
         handle_gemini_error(e)
+    finally:
+        if cached_content is not None:
+            try:
+                cached_content.delete()
+            except Exception as e:
+                logging.warning(f"Could not delete chat context cache: {e}")
+        if uploaded_file is not None:
+            _delete_uploaded_file(uploaded_file)
 
 
-def _print_chat_instructions(content_type):
-    """Print instructions for the chat session."""
+def _print_chat_instructions(content_type, cached=False):
+    """Print instructions for the chat session.
+    
+    Args:
+        content_type (str): Type of content being discussed ('transcript' or 'audio')
+        cached (bool, optional): Whether the content is held in a context cache. Defaults to False.
+    """
 
     print("\n" + "=" * 60)
     print(f"CHAT WITH {content_type.upper()} CONTENT")
@@ -673,7 +1052,8 @@ def _print_chat_instructions(content_type):
     elif content_type == "audio":
         print("You can now chat with the AI about the audio content.")
         print("The AI will listen to the audio and answer your questions.")
-        print("Note: Each question requires re-processing the audio, which may take time.")
+        if not cached:
+            print("Note: Each question requires re-processing the audio, which may take time.")
     print("Type 'exit', 'quit', or press Ctrl+C to end the chat.")
 
 
@@ -704,7 +1084,7 @@ def handle_gemini_transcription_option(audio_file_path):
             transcript_path = transcribe_audio_with_gemini(audio_file_path)
             
             # Verify result is valid
-            if transcript_path and os.path.exists(transcript_path):
+            if transcript_path:
                 print(f"\nTranscription saved successfully to: {transcript_path}")
                 success = True
                 
@@ -737,6 +1117,9 @@ def handle_gemini_transcription_option(audio_file_path):
 def _handle_post_transcription_gemini_options(audio_file_path, transcript_path):
     """Handle options to summarize or chat after Gemini transcription."""
 
+    # Most options work on the uploaded transcript, so upload it while the user decides
+    _background_executor.submit(_prefetch_transcript_upload, transcript_path)
+
     print("\nWhat would you like to do with the content?")
     print("1. Summarize the transcript")
     print("2. Ask a single question about the content")
@@ -744,17 +1127,28 @@ def _handle_post_transcription_gemini_options(audio_file_path, transcript_path):
     print("4. Start an interactive chat with the original audio")
     print("5. Skip")
 
-    content_choice = input("\nEnter your choice (1-5): ")
+    content_choice = input("\nEnter your choice (1-5, or 1,2 for both a summary and an answer): ")
+    choices = {choice.strip() for choice in content_choice.split(",")}
 
     try:
-        if content_choice == "1":
+        if len(choices) > 1 and choices != {"1", "2"}:
+            # Only the summary and the single question can run side by side; the chats are interactive
+            print(f"\nUnsupported combination of choices: {content_choice.strip()}")
+            print("Only options 1 and 2 can be combined (enter 1,2). Skipping additional processing.")
+        elif choices == {"1", "2"}:
+            question = input("\nEnter your question: ")
+            # The two requests are independent, so generate the summary while the answer is being produced
+            summary_future = _background_executor.submit(summarize_transcript, transcript_path)
+            ask_question_about_transcript(transcript_path, question)
+            summary_future.result()
+        elif choices == {"1"}:
             summarize_transcript(transcript_path)
-        elif content_choice == "2":
+        elif choices == {"2"}:
             question = input("\nEnter your question: ")
             ask_question_about_transcript(transcript_path, question)
-        elif content_choice == "3":
+        elif choices == {"3"}:
             chat_with_content(transcript_path, "transcript")
-        elif content_choice == "4":
+        elif choices == {"4"}:
             chat_with_content(audio_file_path, "audio")
         else:
             print("\nSkipping additional processing.")
@@ -782,27 +1176,20 @@ def ask_question_about_transcript(transcript_path, question):
     """
     try:
         _check_gemini_availability()
-        if not os.path.exists(transcript_path):
-            raise FileNotFoundError(f"Transcript file {transcript_path} does not exist.")
+        transcript_file = _get_uploaded_transcript(transcript_path)
 
-        with open(transcript_path, 'r', encoding='utf-8') as f:
-            transcript_text = f.read()
-
-        model = genai.GenerativeModel(GEMINI_MODEL_FLASH)
+        model = _get_model(GEMINI_MODEL_FLASH)
 
         prompt = f"""
-        Based on the following transcript, please answer this question:
+        Based on the attached transcript, please answer this question:
 
         Question: {question}
 
-        Transcript:
-        {transcript_text}
-
         Provide a detailed and accurate answer based only on the information in the transcript.
         """
 
         print("\nGenerating answer using Google's Gemini API...")
-        response = model.generate_content(prompt)
+        response = _call_with_retry(model.generate_content, [prompt, transcript_file])
 
         if not response or not response.text:
             raise APIError("No response from Gemini API.")
@@ -819,6 +1206,67 @@ def ask_question_about_transcript(transcript_path, question):
         return None
 
 
+def ask_questions_about_transcript(transcript_path, questions):
+    """
+    Ask several questions about a transcript in a single Gemini request.
+    
+    The questions share one request, and one pass over the transcript, instead of
+    costing a request each. The answers come back as a JSON array in question order.
+    
+    Args:
+        transcript_path (str): Path to the transcript file
+        questions (list): The questions to ask about the transcript
+        
+    Returns:
+        list: One answer string per question, in the same order, or None if an error occurred
+        
+    Raises:
+        FileNotFoundError: If the transcript file does not exist
+        APIError: If the response is missing or doesn't contain one answer per question
+    """
+    try:
+        _check_gemini_availability()
+        transcript_file = _get_uploaded_transcript(transcript_path)
+
+        model = _get_model(GEMINI_MODEL_FLASH)
+
+        numbered_questions = "\n".join(f"{number}. {question}" for number, question in enumerate(questions, 1))
+        prompt = f"""
+        Based on the attached transcript, please answer each of these questions:
+
+        {numbered_questions}
+
+        Provide a detailed and accurate answer to each question based only on the information in the transcript.
+        Return a JSON array with exactly one answer string per question, in the same order.
+        """
+
+        print(f"\nGenerating {len(questions)} answers using Google's Gemini API...")
+        response = _call_with_retry(model.generate_content, [prompt, transcript_file],
+                                    generation_config=genai.GenerationConfig(
+                                        response_mime_type="application/json", response_schema=list[str]))
+
+        if not response or not response.text:
+            raise APIError("No response from Gemini API.")
+        try:
+            answers = json.loads(response.text)
+        except ValueError:
+            raise APIError("Gemini API returned answers in an unexpected format.")
+        if not isinstance(answers, list) or len(answers) != len(questions):
+            raise APIError(f"Expected {len(questions)} answers from Gemini API.")
+
+        for number, (question, answer) in enumerate(zip(questions, answers), 1):
+            print(f"\nQuestion {number}: {question}")
+            print("=" * 60)
+            print(answer)
+            print("=" * 60)
+
+        return answers
+
+    except Exception as e:
+        handle_gemini_error(e)
+        return None
+
+
 def summarize_transcript(transcript_path):
     """
     Summarize a transcript using Google's Gemini API.
@@ -833,20 +1281,15 @@ def summarize_transcript(transcript_path):
         FileNotFoundError: If the transcript file does not exist
         APIError: If no response is received from Gemini API
     """
+    temp_path = None
     try:
         _check_gemini_availability()
-        if not os.path.exists(transcript_path):
-            raise FileNotFoundError(f"Transcript file {transcript_path} does not exist.")
+        transcript_file = _get_uploaded_transcript(transcript_path)
 
-        with open(transcript_path, 'r', encoding='utf-8') as f:
-            transcript_text = f.read()
+        model = _get_model(GEMINI_MODEL_FLASH)
 
-        model = genai.GenerativeModel(GEMINI_MODEL_FLASH)
-
-        prompt = f"""
-        Please provide a comprehensive summary of the following transcript:
-
-        {transcript_text}
+        prompt = """
+        Please provide a comprehensive summary of the attached transcript.
 
         The summary should:
         1. Capture the main topics and key points
@@ -855,31 +1298,39 @@ def summarize_transcript(transcript_path):
         4. Include any important details, facts, or figures mentioned
         """
 
-        print("\nGenerating summary using Google's Gemini API...")
-        response = model.generate_content(prompt)
+        # Replace a trailing '_gemini_transcript' or '_transcript' in the file name with '_summary';
+        # only the end of the stem is touched, never directories or the middle of the title
+        transcript_path_obj = Path(transcript_path)
+        base_stem = transcript_path_obj.stem.removesuffix('_gemini_transcript').removesuffix('_transcript')
+        summary_path = transcript_path_obj.with_name(f"{base_stem}_summary.txt")
 
-        if not response or not response.text:
+        print("\nGenerating summary using Google's Gemini API...")
+        response = _call_with_retry(model.generate_content, [prompt, transcript_file], stream=True)
+
+        # Write the summary as it is generated into a temporary file in the same directory,
+        # and only rename it into place once the whole response has arrived
+        received_text = False
+        fd, temp_path = tempfile.mkstemp(dir=summary_path.parent, suffix='.txt')
+        with os.fdopen(fd, 'w', encoding='utf-8', buffering=OUTPUT_BUFFER_SIZE) as f:
+            for chunk_text in _iter_response_text(response):
+                f.write(chunk_text)
+                received_text = received_text or bool(chunk_text)
+
+        if not received_text:
             raise APIError("No response from Gemini API.")
 
-        # Generate summary path using Path operations to avoid string replacement issues
-        transcript_path_obj = Path(transcript_path)
-        # Remove '_transcript' suffix if present, then add '_summary'
-        if transcript_path_obj.stem.endswith('_transcript') or transcript_path_obj.stem.endswith('_gemini_transcript'):
-            # Extract the base name without the transcript suffix
-            base_stem = transcript_path_obj.stem.replace('_gemini_transcript', '').replace('_transcript', '')
-            summary_filename = f"{base_stem}_summary.txt"
-        else:
-            # If no transcript suffix found, just add _summary
-            summary_filename = f"{transcript_path_obj.stem}_summary.txt"
-        
-        summary_path = transcript_path_obj.parent / summary_filename
-        
-        with open(summary_path, 'w', encoding='utf-8') as f:
-            f.write(response.text)
-
+        os.replace(temp_path, summary_path)
+        temp_path = None
         print(f"\nSummary saved to: {summary_path}")
         return str(summary_path)
 
     except Exception as e:
         handle_gemini_error(e)
-        return None
\ No newline at end of file
+        return None
+    finally:
+        # Don't leave a partial summary behind if the response failed or was empty
+        if temp_path is not None:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
@@ -4,7 +4,6 @@ Handles user interaction and orchestrates the download and transcription process
 """
 
 import os
-import yt_dlp
 from pathlib import Path
 from config import load_config
 from utils import validate_url, handle_download_error, handle_filesystem_error, handle_generic_error
@@ -125,6 +124,7 @@ def _handle_standard_download(url, download_path, choice):
 
 def handle_download():
     """Main function to handle the download process."""
+    import yt_dlp  # Deferred so the banner is shown without waiting for yt-dlp to load
 
     try:
         url = _get_user_input("Please enter the YouTube video URL: ")
@@ -181,8 +181,8 @@ def main():
     print("======================================================")
     print("Features:")
     print("- Download videos in MP4 format")
-    print("- Extract audio as separate MP3 files")
-    print("- Download both video and audio as separate files (no merging)")
+    print("- Extract audio as MP3 files")
+    print("- Download both video and audio as separate files (M4A audio, no merging)")
     print("- Transcribe audio using OpenAI's Whisper model or Google's Gemini API")
     print("- Summarize transcripts using Google's Gemini API")
     print("- Interactive chat with transcript or audio content using Gemini")
@@ -41,6 +41,68 @@ def test_configuration_validation():
         print(f"❌ Configuration validation error: {e}")
         return False
 
+def test_env_file_loading():
+    """Test parsing of .env files"""
+    print("\nTesting .env file loading...")
+    env_keys = ["TEST_ENV_DOUBLE", "TEST_ENV_SINGLE", "TEST_ENV_EXPORT", "TEST_ENV_COMMENT",
+                "TEST_ENV_QUOTED_HASH", "TEST_ENV_EXISTING", "TEST_ENV_QUOTED_COMMENT",
+                "TEST_ENV_EMPTY_COMMENT", "TEST_ENV_TAB_COMMENT", "TEST_ENV_ESCAPES",
+                "TEST_ENV_SINGLE_LITERAL", "TEST_ENV_HASH_IN_VALUE"]
+    try:
+        from config import _load_env_file
+
+        env_contents = "\n".join([
+            "# A comment line",
+            'TEST_ENV_DOUBLE="double quoted value"',
+            "TEST_ENV_SINGLE='single quoted value'",
+            "export TEST_ENV_EXPORT=exported",
+            "TEST_ENV_COMMENT=value # inline comment",
+            'TEST_ENV_QUOTED_HASH="value # not a comment"',
+            "TEST_ENV_EXISTING=from file",
+            'TEST_ENV_QUOTED_COMMENT="abc" # my key',
+            "TEST_ENV_EMPTY_COMMENT=  # empty",
+            "TEST_ENV_TAB_COMMENT=v\t# c",
+            'TEST_ENV_ESCAPES="a\\nb \\"quoted\\""',
+            "TEST_ENV_SINGLE_LITERAL='a\\nb'",
+            "TEST_ENV_HASH_IN_VALUE=url#fragment",
+        ])
+        expected = {
+            "TEST_ENV_DOUBLE": "double quoted value",
+            "TEST_ENV_SINGLE": "single quoted value",
+            "TEST_ENV_EXPORT": "exported",
+            "TEST_ENV_COMMENT": "value",
+            "TEST_ENV_QUOTED_HASH": "value # not a comment",
+            "TEST_ENV_EXISTING": "from environment",  # Existing variables take precedence
+            "TEST_ENV_QUOTED_COMMENT": "abc",
+            "TEST_ENV_EMPTY_COMMENT": "",
+            "TEST_ENV_TAB_COMMENT": "v",
+            "TEST_ENV_ESCAPES": 'a\nb "quoted"',
+            "TEST_ENV_SINGLE_LITERAL": "a\\nb",
+            "TEST_ENV_HASH_IN_VALUE": "url#fragment",
+        }
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            env_path = os.path.join(temp_dir, ".env")
+            Path(env_path).write_text(env_contents, encoding="utf-8")
+            os.environ["TEST_ENV_EXISTING"] = "from environment"
+            _load_env_file(env_path)
+            # A missing file is ignored
+            _load_env_file(os.path.join(temp_dir, "missing.env"))
+
+        for key, value in expected.items():
+            if os.environ.get(key) != value:
+                print(f"❌ {key} loaded as {os.environ.get(key)!r}, expected {value!r}")
+                return False
+
+        print("✅ .env file loading working correctly")
+        return True
+    except Exception as e:
+        print(f"❌ .env file loading error: {e}")
+        return False
+    finally:
+        for key in env_keys:
+            os.environ.pop(key, None)
+
 def test_memory_monitoring():
     """Test memory monitoring functionality"""
     print("\nTesting memory monitoring...")
@@ -58,34 +120,101 @@ def test_memory_monitoring():
         print(f"❌ Memory monitoring error: {e}")
         return False
 
-def test_file_locking():
-    """Test cross-platform file locking"""
-    print("\nTesting file locking...")
+def test_atomic_transcript_save():
+    """Test that transcripts are written atomically through a temporary file"""
+    print("\nTesting atomic transcript saving...")
     try:
-        import portalocker
-        
-        # Create a temporary file to test locking
-        with tempfile.NamedTemporaryFile(mode='w', delete=False) as temp_file:
-            temp_path = temp_file.name
-            
-        try:
-            with open(temp_path, 'w') as f:
-                portalocker.lock(f, portalocker.LOCK_EX)
-                f.write("test content")
-                # Lock is automatically released when file is closed
-            
-            print("✅ File locking working correctly")
-            return True
-        finally:
-            # Clean up
-            if os.path.exists(temp_path):
-                os.unlink(temp_path)
-                
-    except ImportError:
-        print("⚠️ portalocker not available - file locking disabled")
-        return True  # This is acceptable
+        from gemini_api import _save_transcript
+        from utils import FilesystemError
+
+        def _failing_chunks():
+            yield "partial text"
+            raise IOError("stream interrupted")
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            audio_path = os.path.join(temp_dir, "audio.m4a")
+
+            transcript_path = _save_transcript(audio_path, iter(["first ", "version"]), "gemini")
+            if Path(transcript_path).read_text(encoding="utf-8") != "first version":
+                print("❌ Saved transcript has unexpected contents")
+                return False
+
+            # A failed write must leave the previous transcript untouched
+            try:
+                _save_transcript(audio_path, _failing_chunks(), "gemini")
+                print("❌ Failed write did not raise FilesystemError")
+                return False
+            except FilesystemError:
+                pass
+            if Path(transcript_path).read_text(encoding="utf-8") != "first version":
+                print("❌ Failed write replaced the existing transcript")
+                return False
+
+            leftover_files = set(os.listdir(temp_dir)) - {os.path.basename(transcript_path)}
+            if leftover_files:
+                print(f"❌ Temporary files left behind: {leftover_files}")
+                return False
+
+        print("✅ Atomic transcript saving working correctly")
+        return True
+    except Exception as e:
+        print(f"❌ Atomic transcript saving error: {e}")
+        return False
+
+class _FakeYoutubeDL:
+    """Stand-in for yt_dlp.YoutubeDL that only sanitizes info"""
+
+    def sanitize_info(self, info):
+        if info.get("unserializable"):
+            raise TypeError("Object of type set is not JSON serializable")
+        return dict(info)
+
+
+def test_info_cache():
+    """Test the on-disk video info cache"""
+    print("\nTesting video info cache...")
+    try:
+        import time
+        from unittest import mock
+        import downloader
+
+        with tempfile.TemporaryDirectory() as temp_dir, \
+                mock.patch.object(downloader, "INFO_CACHE_DIR", temp_dir):
+            ydl = _FakeYoutubeDL()
+            url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+            info = {"id": "dQw4w9WgXcQ", "title": "Test video"}
+            cache_file = downloader._info_cache_file(url)
+
+            # Entries are written atomically, without leaving temporary files behind
+            downloader._write_info_file(ydl, url, info)
+            if downloader._read_info_file(url) != info or os.listdir(temp_dir) != [os.path.basename(cache_file)]:
+                print("❌ Cached info was not written correctly")
+                return False
+            downloader._write_info_file(ydl, url, {"id": "dQw4w9WgXcQ", "unserializable": True})
+            if downloader._read_info_file(url) != info or len(os.listdir(temp_dir)) != 1:
+                print("❌ A failed write replaced the entry or left a temporary file")
+                return False
+
+            # Expired entries are ignored and deleted when read
+            expired = time.time() - downloader.INFO_CACHE_TTL - 1
+            os.utime(cache_file, (expired, expired))
+            if downloader._read_info_file(url) is not None or os.path.exists(cache_file):
+                print("❌ Expired entry was returned or kept")
+                return False
+
+            # Writing an entry prunes expired entries of other URLs
+            other_url = "https://www.youtube.com/watch?v=other"
+            downloader._write_info_file(ydl, other_url, info)
+            os.utime(downloader._info_cache_file(other_url), (expired, expired))
+            downloader._write_info_file(ydl, url, info)
+            if os.listdir(temp_dir) != [os.path.basename(cache_file)]:
+                print(f"❌ Expired entries were not pruned: {os.listdir(temp_dir)}")
+                return False
+
+        print("✅ Video info cache working correctly")
+        return True
     except Exception as e:
-        print(f"❌ File locking error: {e}")
+        print(f"❌ Video info cache error: {e}")
         return False
 
 def test_url_validation():
@@ -142,6 +271,32 @@ def test_timeout_configuration():
         print(f"❌ Timeout configuration error: {e}")
         return False
 
+def test_download_timeout():
+    """Test that the progress hook enforces the download timeout"""
+    print("\nTesting download timeout enforcement...")
+    try:
+        from downloader import _make_progress_hook
+        from utils import DownloadError
+
+        # A negative timeout puts the deadline in the past
+        progress_hook = _make_progress_hook(-1, show_progress=False)
+
+        # A finished download is kept even though the deadline has passed
+        progress_hook({'status': 'finished', 'downloaded_bytes': 100, 'total_bytes': 100})
+
+        try:
+            progress_hook({'status': 'downloading', 'downloaded_bytes': 50, 'total_bytes': 100})
+            print("❌ Download past the deadline was not aborted")
+            return False
+        except DownloadError:
+            pass
+
+        print("✅ Download timeout enforcement working correctly")
+        return True
+    except Exception as e:
+        print(f"❌ Download timeout error: {e}")
+        return False
+
 def test_error_handling():
     """Test standardized error handling"""
     print("\nTesting error handling...")
@@ -165,6 +320,219 @@ def test_error_handling():
         print(f"❌ Error handling test failed: {e}")
         return False
 
+def test_request_rate_limiting():
+    """Test the token bucket that paces Gemini requests"""
+    print("\nTesting request rate limiting...")
+    try:
+        from gemini_api import _TokenBucket
+
+        bucket = _TokenBucket(requests_per_minute=60, capacity=3)  # One token per second
+        burst_delays = [bucket._reserve() for _ in range(3)]
+        if any(burst_delays):
+            print(f"❌ Burst requests were delayed: {burst_delays}")
+            return False
+
+        # Once the burst is used up, each request waits for its token to refill
+        refill_delays = [bucket._reserve() for _ in range(2)]
+        if not (0.9 < refill_delays[0] <= 1.0 and 1.9 < refill_delays[1] <= 2.0):
+            print(f"❌ Unexpected refill delays: {refill_delays}")
+            return False
+
+        print("✅ Request rate limiting working correctly")
+        return True
+    except Exception as e:
+        print(f"❌ Request rate limiting error: {e}")
+        return False
+
+def test_retry_delay():
+    """Test which Gemini errors are retried and for how long"""
+    print("\nTesting retry backoff...")
+    try:
+        from gemini_api import _retry_delay, API_RETRY_ATTEMPTS, API_RETRY_BASE_DELAY, API_RETRY_JITTER
+
+        delay = _retry_delay(0, Exception("429 Resource has been exhausted"))
+        if delay is None or not API_RETRY_BASE_DELAY <= delay <= API_RETRY_BASE_DELAY + API_RETRY_JITTER:
+            print(f"❌ Unexpected delay for a rate-limit error: {delay}")
+            return False
+
+        delay = _retry_delay(1, Exception("503 Service Unavailable"))
+        if delay is None or delay < 2 * API_RETRY_BASE_DELAY:
+            print(f"❌ Delay did not grow with the attempt number: {delay}")
+            return False
+
+        if _retry_delay(0, Exception("400 Invalid argument")) is not None:
+            print("❌ Non-retryable error was retried")
+            return False
+
+        if _retry_delay(API_RETRY_ATTEMPTS - 1, Exception("503 Service Unavailable")) is not None:
+            print("❌ Retried after the last attempt")
+            return False
+
+        print("✅ Retry backoff working correctly")
+        return True
+    except Exception as e:
+        print(f"❌ Retry backoff error: {e}")
+        return False
+
+class _FakeResponse:
+    """Minimal stand-in for a Gemini response"""
+
+    def __init__(self, text):
+        self.text = text
+
+
+class _LoopBoundModel:
+    """Stand-in for a cached GenerativeModel whose async client is tied to the first event loop"""
+
+    def __init__(self):
+        self._loop = None
+
+    def generate_content(self, contents):
+        return _FakeResponse("transcribed text")
+
+    async def generate_content_async(self, contents):
+        import asyncio
+        loop = asyncio.get_running_loop()
+        if self._loop is None:
+            self._loop = loop
+        elif self._loop is not loop:
+            raise RuntimeError("Event loop is closed")
+        return _FakeResponse("transcribed text")
+
+
+def _patch_gemini_transcription(gemini_api, model):
+    """Patch the Gemini helpers used by transcription so no network access is needed"""
+    from unittest import mock
+
+    return [
+        mock.patch.object(gemini_api, "_get_model", lambda *args, **kwargs: model),
+        mock.patch.object(gemini_api, "_upload_file", lambda path, mime_type: object()),
+        mock.patch.object(gemini_api, "_delete_uploaded_file", lambda uploaded_file: None),
+        mock.patch.object(gemini_api, "_split_audio", lambda path, output_dir: []),
+        mock.patch.object(gemini_api, "_request_rate_limiter", gemini_api._TokenBucket(6000, 100)),
+    ]
+
+def test_repeated_transcription():
+    """Test that several transcriptions can run in the same process"""
+    print("\nTesting repeated transcription...")
+    try:
+        from contextlib import ExitStack
+        import gemini_api
+
+        with ExitStack() as stack:
+            for patch in _patch_gemini_transcription(gemini_api, _LoopBoundModel()):
+                stack.enter_context(patch)
+            for _ in range(2):
+                if gemini_api._transcribe_audio_gemini("audio.m4a") != "transcribed text":
+                    print("❌ Unexpected transcript text")
+                    return False
+
+        print("✅ Repeated transcription working correctly")
+        return True
+    except Exception as e:
+        print(f"❌ Repeated transcription error: {e}")
+        return False
+
+def test_batch_transcription_after_single():
+    """Test that batch transcription works after a single transcription in the same process"""
+    print("\nTesting batch transcription after a single transcription...")
+    try:
+        from contextlib import ExitStack
+        from unittest import mock
+        import gemini_api
+
+        with tempfile.TemporaryDirectory() as temp_dir, ExitStack() as stack:
+            for patch in _patch_gemini_transcription(gemini_api, _LoopBoundModel()):
+                stack.enter_context(patch)
+            stack.enter_context(mock.patch.object(gemini_api, "_check_gemini_availability", lambda: True))
+
+            audio_paths = []
+            for name in ("first.m4a", "second.m4a"):
+                audio_path = os.path.join(temp_dir, name)
+                Path(audio_path).write_bytes(b"audio")
+                audio_paths.append(audio_path)
+
+            gemini_api._transcribe_audio_gemini(audio_paths[0])
+            transcript_paths = gemini_api.transcribe_audio_files_with_gemini(audio_paths)
+
+            if None in transcript_paths:
+                print("❌ Batch transcription failed after a single transcription")
+                return False
+            if any(Path(path).read_text(encoding="utf-8") != "transcribed text" for path in transcript_paths):
+                print("❌ Unexpected transcript file contents")
+                return False
+
+        print("✅ Batch transcription after a single transcription working correctly")
+        return True
+    except Exception as e:
+        print(f"❌ Batch transcription error: {e}")
+        return False
+
+class _EchoModel:
+    """Stand-in for a GenerativeModel that transcribes an upload as its name"""
+
+    def generate_content(self, contents):
+        return _FakeResponse(f"text of {contents[1]}")
+
+
+def test_segmented_transcription():
+    """Test that long audio is split, transcribed per segment and joined in order"""
+    print("\nTesting segmented transcription...")
+    try:
+        import subprocess
+        from contextlib import ExitStack
+        from unittest import mock
+        import gemini_api
+
+        commands = []
+        uploads = []
+
+        def _fake_run(command, **kwargs):
+            commands.append(command[0])
+            if command[0] == "ffprobe":
+                return subprocess.CompletedProcess(command, 0, stdout=f"{duration}\n", stderr="")
+            # Create the segments out of order to check they are sorted by name
+            output_dir = os.path.dirname(command[-1])
+            for index in (2, 0, 1):
+                Path(output_dir, f"segment_{index:04d}.m4a").write_bytes(b"audio")
+            return subprocess.CompletedProcess(command, 0, stdout=b"", stderr=b"")
+
+        def _fake_upload(path, mime_type):
+            uploads.append(path)
+            return os.path.basename(path)
+
+        with ExitStack() as stack:
+            for patch in _patch_gemini_transcription(gemini_api, _EchoModel()):
+                if patch.attribute not in ("_split_audio", "_upload_file"):
+                    stack.enter_context(patch)
+            stack.enter_context(mock.patch.object(gemini_api, "FFMPEG_PATH", "ffmpeg"))
+            stack.enter_context(mock.patch.object(gemini_api, "FFPROBE_PATH", "ffprobe"))
+            stack.enter_context(mock.patch.object(gemini_api.subprocess, "run", _fake_run))
+            stack.enter_context(mock.patch.object(gemini_api, "_upload_file", _fake_upload))
+
+            # Long audio is split into segments that are joined in playback order
+            duration = 3 * gemini_api.TRANSCRIPTION_SEGMENT_SECONDS
+            transcript = gemini_api._transcribe_audio_gemini("long.m4a")
+            expected = "\n\n".join(f"text of segment_{index:04d}.m4a" for index in range(3))
+            if transcript != expected or commands != ["ffprobe", "ffmpeg"]:
+                print(f"❌ Unexpected segmented transcript: {transcript!r}")
+                return False
+
+            # Audio that fits in one segment is uploaded as is, without running ffmpeg
+            commands.clear()
+            uploads.clear()
+            duration = gemini_api.TRANSCRIPTION_SEGMENT_SECONDS - 1
+            transcript = gemini_api._transcribe_audio_gemini("short.m4a")
+            if transcript != "text of short.m4a" or commands != ["ffprobe"] or uploads != ["short.m4a"]:
+                print(f"❌ Short audio was not sent whole: {commands}, {uploads}")
+                return False
+
+        print("✅ Segmented transcription working correctly")
+        return True
+    except Exception as e:
+        print(f"❌ Segmented transcription error: {e}")
+        return False
+
 def main():
     """Run all tests"""
     print("YouTube Downloader - Improvements Verification Test")
@@ -173,11 +541,19 @@ def main():
     tests = [
         test_imports,
         test_configuration_validation,
+        test_env_file_loading,
         test_memory_monitoring,
-        test_file_locking,
+        test_atomic_transcript_save,
+        test_info_cache,
         test_url_validation,
         test_timeout_configuration,
-        test_error_handling
+        test_download_timeout,
+        test_error_handling,
+        test_request_rate_limiting,
+        test_retry_delay,
+        test_repeated_transcription,
+        test_batch_transcription_after_single,
+        test_segmented_transcription
     ]
     
     passed = 0
@@ -193,8 +569,8 @@ def main():
     if passed == total:
         print("🎉 All improvements verified successfully!")
         print("\nKey improvements implemented:")
-        print("✅ Cross-platform file locking with portalocker")
-        print("✅ Memory management with monitoring and limits")
+        print("✅ Atomic transcript writes with a temporary file and os.replace")
+        print("✅ Available memory reporting")
         print("✅ Comprehensive timeout handling")
         print("✅ Improved API key validation")
         print("✅ Standardized error handling")
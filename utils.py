@@ -5,16 +5,28 @@ Includes URL validation, API key handling, file operations, and error handling.
 
 import os
 import time
+import queue
+import atexit
 import logging
+import logging.handlers
 from urllib.parse import urlparse
 from getpass import getpass
 from pathlib import Path
-from config import load_config, ConfigurationError
+from config import load_config, ConfigurationError, MEDIA_EXTENSION_PRIORITY
 # Removed magic library dependency
 
 # Initialize logging (you can customize this)
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Hand records to a background thread so logging calls never block on writes;
+# the handlers configured above do the formatting and output there
+_root_logger = logging.getLogger()
+_log_listener = logging.handlers.QueueListener(queue.SimpleQueue(), *_root_logger.handlers,
+                                               respect_handler_level=True)
+_root_logger.handlers = [logging.handlers.QueueHandler(_log_listener.queue)]
+_log_listener.start()
+atexit.register(_log_listener.stop)  # Flushes the records still queued at exit
+
 # Load configuration
 config = load_config()
 MEDIA_EXTENSIONS = config["media_extensions"]
@@ -120,7 +132,7 @@ def find_downloaded_file(expected_path, download_path):
         return str(expected_file)
 
     # Try to find a file with the same stem and a supported extension
-    for ext in MEDIA_EXTENSIONS:
+    for ext in MEDIA_EXTENSION_PRIORITY:
         potential_file = base_dir / (expected_file.stem + ext)
         if potential_file.exists():
             logging.info(f"Found file with matching stem: {potential_file}")